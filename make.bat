@@ -1,20 +1,10 @@
 @SETLOCAL
 @IF "%PYTHONPATH%" == "" SET PYTHONPATH=%CHDIR%
-@IF "%PYTHON27_X86%" == "" SET PYTHON27_X86=c:\Python27-x86\python.exe
-@IF "%PYTHON27_X64%" == "" SET PYTHON27_X64=c:\Python27-x64\python.exe
-@IF "%PYTHON32_X86%" == "" SET PYTHON32_X86=c:\Python32-x86\python.exe
-@IF "%PYTHON32_X64%" == "" SET PYTHON32_X64=c:\Python32-x64\python.exe
 @IF "%PYTHON33_X86%" == "" SET PYTHON33_X86=c:\Python33-x86\python.exe
 @IF "%PYTHON33_X64%" == "" SET PYTHON33_X64=c:\Python33-x64\python.exe
-@IF "%PYTHON%" == "" SET PYTHON=%PYTHON27_X64%
-@IF "%PYPY18%" == "" SET PYPY18=c:\pypy-1.8\pypy.exe
-@IF "%PYPY19%" == "" SET PYPY19=c:\pypy-1.9\pypy.exe
-@IF "%PYPY20%" == "" SET PYPY20=c:\pypy-2.0\pypy.exe
-@IF "%IRONPYTHON27_X86%" == "" SET IRONPYTHON27_X86=c:\IronPython-2.7.3\ipy.exe
-@IF "%IRONPYTHON27_X64%" == "" SET IRONPYTHON27_X64=c:\IronPython-2.7.3\ipy64.exe
-@SET INTERPRETERS=%PYTHON27_X86%;%PYTHON27_X64%;%PYTHON32_X86%;^
- %PYTHON32_X64%;%PYTHON33_X86%;%PYTHON33_X64%;%PYTHON%;%PYPY18%;^
- %PYPY19%;%PYPY20%;%IRONPYTHON27_X86%;%IRONPYTHON27_X64%
+@IF "%PYTHON%" == "" SET PYTHON=%PYTHON33_X64%
+@IF "%PYPY3%" == "" SET PYPY3=c:\pypy3-2.4.0\pypy.exe
+@SET INTERPRETERS=%PYTHON33_X86%;%PYTHON33_X64%;%PYTHON%;%PYPY3%
 
 @IF "%~1" == "" GOTO :all
 @GOTO :%~1
@@ -102,16 +92,9 @@
 
 :purge_installs
 @echo Deleting data...
-@RMDIR /S /Q C:\Python27-x86\Lib\site-packages\openal
-@RMDIR /S /Q C:\Python27-x64\Lib\site-packages\openal
-@RMDIR /S /Q C:\Python32-x86\Lib\site-packages\openal
-@RMDIR /S /Q C:\Python32-x64\Lib\site-packages\openal
 @RMDIR /S /Q C:\Python33-x86\Lib\site-packages\openal
 @RMDIR /S /Q C:\Python33-x64\Lib\site-packages\openal
-@RMDIR /S /Q C:\pypy-1.8\site-packages\openal
-@RMDIR /S /Q C:\pypy-1.9\site-packages\openal
-@RMDIR /S /Q C:\pypy-2.0\site-packages\openal
-@RMDIR /S /Q C:\IronPython-2.7.3\Lib\site-packages\openal
+@RMDIR /S /Q C:\pypy3-2.4.0\site-packages\openal
 @echo done
 @GOTO :eof
 
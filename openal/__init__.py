@@ -2,14 +2,73 @@
 import os
 import sys
 import ctypes
+import threading
+import time
 import warnings
-from ctypes.util import find_library
+from collections import namedtuple
 
-__all__ = ["get_dll_file", "version_info"]
+__all__ = ["get_dll_file", "version_info", "UnavailableFunctionError",
+           "CallStats", "set_call_stats_enabled", "get_call_stats",
+           "reset_call_stats"]
 
 
-def _findlib(libnames, path=None):
-    """Internal helper function to find the requested DLL(s)."""
+_clock = time.perf_counter
+
+
+CallStats = namedtuple("CallStats", ["calls", "time", "argbytes",
+                                     "maxargbytes"])
+
+# Functions, which pass the size of their data as explicit argument, since
+# their data pointer may be a plain address.
+_SIZEARGS = {"alBufferData": 3}
+
+
+def _get_argbytes(funcname, args):
+    """Internal helper function to get the amount of bytes passed via the
+    buffer and ctypes array arguments of a function call."""
+    index = _SIZEARGS.get(funcname)
+    if index is not None and len(args) > index:
+        return args[index]
+    argbytes = 0
+    for arg in args:
+        if isinstance(arg, (bytes, bytearray)):
+            argbytes += len(arg)
+        elif isinstance(arg, (ctypes.Array, ctypes.Structure)):
+            argbytes += ctypes.sizeof(arg)
+    return argbytes
+
+
+class UnavailableFunctionError(AttributeError):
+    """Raised, if a function is not provided by the loaded OpenAL library.
+    """
+    def __init__(self, funcname, libfile):
+        AttributeError.__init__(self, "function '%s' is not available in %s"
+                                % (funcname, libfile))
+        self.funcname = funcname
+
+
+def _get_platform_names(names):
+    """Internal helper function to get the names of the current platform
+    from a dict of platform-specific names."""
+    platform = sys.platform
+    if platform == "cli" and platform not in names:
+        # if not explicitly specified, use the Win32 libs for IronPython
+        platform = "win32"
+    if platform not in names:
+        platform = "DEFAULT"
+    return names[platform]
+
+
+def _findlib(libnames, path=None, sonames=None, cached=None):
+    """Internal helper function to find the requested DLL(s).
+
+    Yields (dllfile, cacheable) tuples for the DLLs found in path first,
+    followed by the passed sonames, the cached location of a previous
+    ctypes.util.find_library() result and the DLLs found by
+    ctypes.util.find_library(), which is only invoked, if none of the
+    previous ones could be loaded. cacheable indicates, if the DLL was found
+    by ctypes.util.find_library().
+    """
     platform = sys.platform
     if platform in ("win32", "cli"):
         suffix = ".dll"
@@ -21,45 +80,144 @@ def _findlib(libnames, path=None):
     searchfor = libnames
     if type(libnames) is dict:
         # different library names for the platforms
-        if platform == "cli" and platform not in libnames:
-            # if not explicitly specified, use the Win32 libs for IronPython
-            platform = "win32"
-        if platform not in libnames:
-            platform = "DEFAULT"
-        searchfor = libnames[platform]
-    results = []
+        searchfor = _get_platform_names(libnames)
     if path:
         for libname in searchfor:
             dllfile = os.path.join(path, "%s%s" % (libname, suffix))
             if os.path.exists(dllfile):
-                results.append(dllfile)
+                yield dllfile, False
+    if sonames:
+        # Well-known library names, which can be loaded by the dynamic
+        # linker directly.
+        for soname in _get_platform_names(sonames):
+            yield soname, False
+    if cached:
+        yield cached, True
+    # find_library() runs external tools like ldconfig or gcc on some
+    # platforms, which is slow.
+    from ctypes.util import find_library
     for libname in searchfor:
         dllfile = find_library(libname)
         if dllfile:
-            results.append(dllfile)
-    return results
+            yield dllfile, True
+
+
+def _get_dll_cachefile():
+    """Internal helper function to get the file, which caches the locations
+    of found DLLs.
+
+    PYAL_DLL_CACHE can be set to use another file or to an empty string to
+    disable the cache.
+    """
+    cachefile = os.getenv("PYAL_DLL_CACHE")
+    if cachefile is not None:
+        return cachefile or None
+    if sys.platform in ("win32", "cli"):
+        cachedir = os.getenv("LOCALAPPDATA")
+    else:
+        home = os.path.expanduser("~")
+        if home == "~":
+            return None
+        if sys.platform == "darwin":
+            cachedir = os.path.join(home, "Library", "Caches")
+        else:
+            cachedir = os.getenv("XDG_CACHE_HOME") or \
+                os.path.join(home, ".cache")
+    if not cachedir:
+        return None
+    return os.path.join(cachedir, "pyal", "dllcache")
+
+
+def _read_dll_cache(cachefile):
+    """Internal helper function to read the key and DLL location pairs of
+    the cache file."""
+    cache = {}
+    try:
+        with open(cachefile) as fp:
+            for line in fp:
+                key, sep, dllfile = line.rstrip("\n").partition("\t")
+                if sep and dllfile:
+                    cache[key] = dllfile
+    except (IOError, OSError):
+        pass
+    return cache
+
+
+def _write_dll_cache(cachefile, cache):
+    """Internal helper function to write the key and DLL location pairs to
+    the cache file.
+
+    The file is replaced at once, so that concurrently starting processes do
+    not see partially written files. Errors are silently ignored.
+    """
+    tmpfile = "%s.%d" % (cachefile, os.getpid())
+    try:
+        cachedir = os.path.dirname(cachefile)
+        if cachedir and not os.path.isdir(cachedir):
+            os.makedirs(cachedir)
+        with open(tmpfile, "w") as fp:
+            for key, dllfile in sorted(cache.items()):
+                fp.write("%s\t%s\n" % (key, dllfile))
+        getattr(os, "replace", os.rename)(tmpfile, cachefile)
+    except (IOError, OSError):
+        try:
+            os.remove(tmpfile)
+        except OSError:
+            pass
 
 
 class _DLL(object):
     """Function wrapper around the different DLL functions. Do not use or
     instantiate this one directly from your user code.
     """
-    def __init__(self, libinfo, libnames, path=None):
+    def __init__(self, libinfo, libnames, path=None, sonames=None,
+                 cachefile=None, instrumented=False):
         self._dll = None
-        foundlibs = _findlib(libnames, path)
-        if len(foundlibs) == 0:
-            raise RuntimeError("could not find any library for %s" % libinfo)
-        for libfile in foundlibs:
+        self._instrumented = instrumented
+        # function name -> [calls, time, argbytes, maxargbytes]
+        self._stats = {}
+        self._statslock = threading.Lock()
+        # (namespace, prototypes) of the bind_functions() calls
+        self._namespaces = []
+        # callables invoked after set_instrumented() bound the functions again
+        self._rebindhooks = []
+        # The found DLL depends on the platform, the architecture and the
+        # search path.
+        key = "%s-%d:%s" % (sys.platform, ctypes.sizeof(ctypes.c_void_p) * 8,
+                            path or "")
+        cache = {}
+        if cachefile:
+            cache = _read_dll_cache(cachefile)
+        cached = cache.get(key)
+        quiet = set()
+        if sonames:
+            quiet.update(_get_platform_names(sonames))
+        if cached:
+            quiet.add(cached)
+        found = False
+        cacheable = False
+        for libfile, cacheable in _findlib(libnames, path, sonames, cached):
             try:
                 self._dll = ctypes.CDLL(libfile)
                 self._libfile = libfile
                 break
             except Exception as exc:
                 # Could not load it, silently ignore that issue and move
-                # to the next one.
-                warnings.warn(exc, ImportWarning)
+                # to the next one. Cached or well-known names, which do not
+                # exist on the system, are expected to fail.
+                if libfile not in quiet:
+                    found = True
+                    warnings.warn(exc, ImportWarning)
         if self._dll is None:
+            if not found:
+                raise RuntimeError("could not find any library for %s" %
+                                   libinfo)
             raise RuntimeError("could not load any library for %s" % libinfo)
+        # Only the slow find_library() results are cached, so that
+        # libraries in path or well-known ones are always preferred.
+        if cachefile and cacheable and cached != self._libfile:
+            cache[key] = self._libfile
+            _write_dll_cache(cachefile, cache)
         if path is not None and sys.platform in ("win32", "cli") and \
             path in self._libfile:
             os.environ["PATH"] += ";%s" % path
@@ -67,11 +225,117 @@ class _DLL(object):
     def bind_function(self, funcname, args=None, returns=None):
         """Binds the passed argument and return value types to the specified
         function."""
-        func = getattr(self._dll, funcname)
+        try:
+            func = getattr(self._dll, funcname)
+        except AttributeError:
+            raise UnavailableFunctionError(funcname, self._libfile)
         func.argtypes = args
         func.restype = returns
+        if self._instrumented:
+            return self._instrument(funcname, func)
         return func
 
+    def _instrument(self, funcname, func):
+        """Wraps the function to count its calls, their time and the amount
+        of passed bytes."""
+        lock = self._statslock
+        with lock:
+            stats = self._stats.setdefault(funcname, [0, 0.0, 0, 0])
+
+        def wrapper(*args):
+            argbytes = _get_argbytes(funcname, args)
+            start = _clock()
+            try:
+                return func(*args)
+            finally:
+                elapsed = _clock() - start
+                with lock:
+                    stats[0] += 1
+                    stats[1] += elapsed
+                    stats[2] += argbytes
+                    if argbytes > stats[3]:
+                        stats[3] = argbytes
+        wrapper.__name__ = funcname
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def set_instrumented(self, instrumented):
+        """Enables or disables the call statistics of the bound functions.
+
+        The functions, which already were bound via bind_functions(), are
+        bound again. References to them, which were taken before, are not
+        affected, unless they are updated by a hook registered via
+        add_rebind_hook().
+        """
+        self._instrumented = bool(instrumented)
+        for namespace, prototypes in self._namespaces:
+            for funcname, (args, returns) in prototypes.items():
+                if funcname in namespace:
+                    namespace[funcname] = self.bind_function(funcname, args,
+                                                             returns)
+        for hook in self._rebindhooks:
+            hook()
+
+    def add_rebind_hook(self, hook):
+        """Adds a callable, which is invoked without arguments, after
+        set_instrumented() bound the functions again, so that it can update
+        the references it keeps to them."""
+        self._rebindhooks.append(hook)
+
+    @property
+    def instrumented(self):
+        """Indicates, whether the call statistics are gathered."""
+        return self._instrumented
+
+    def get_stats(self):
+        """Gets the call statistics as dict of function names and CallStats.
+        """
+        with self._statslock:
+            return dict((funcname, CallStats(*stats)) for funcname, stats
+                        in self._stats.items() if stats[0] > 0)
+
+    def reset_stats(self):
+        """Resets the call statistics."""
+        with self._statslock:
+            for stats in self._stats.values():
+                stats[:] = [0, 0.0, 0, 0]
+
+    def bind_functions(self, namespace, prototypes):
+        """Binds the functions of prototypes, a dict of function names and
+        (argument types, return type) tuples, to the passed module namespace.
+
+        Each function is bound on its first access via the module's
+        __getattr__() and kept in the namespace afterwards, so that a missing
+        function only fails on using it. Python versions without support for
+        module __getattr__() functions bind all available functions at once.
+        """
+        self._namespaces.append((namespace, prototypes))
+        if sys.version_info < (3, 7):
+            for funcname, (args, returns) in prototypes.items():
+                try:
+                    namespace[funcname] = self.bind_function(funcname, args,
+                                                             returns)
+                except UnavailableFunctionError:
+                    pass
+            return
+
+        modname = namespace["__name__"]
+
+        def __getattr__(name):
+            if name not in prototypes:
+                raise AttributeError("module '%s' has no attribute '%s'" %
+                                     (modname, name))
+            args, returns = prototypes[name]
+            func = self.bind_function(name, args, returns)
+            namespace[name] = func
+            return func
+
+        def __dir__():
+            return sorted(set(namespace) | set(prototypes))
+
+        namespace["__getattr__"] = __getattr__
+        namespace["__dir__"] = __dir__
+
     @property
     def libfile(self):
         """Gets the filename of the loaded library."""
@@ -81,7 +345,12 @@ class _DLL(object):
 dll = _DLL("OpenAL", {"win32": ["OpenAL", "OpenAL32"],
                       "darwin": ["OpenAL"],
                       "DEFAULT": ["openal", "OpenAL"]},
-           os.getenv("PYAL_DLL_PATH"))
+           os.getenv("PYAL_DLL_PATH"),
+           {"win32": ["OpenAL32.dll", "soft_oal.dll"],
+            "darwin": ["/System/Library/Frameworks/OpenAL.framework/OpenAL",
+                       "libopenal.1.dylib"],
+            "DEFAULT": ["libopenal.so.1", "libopenal.so"]},
+           _get_dll_cachefile(), bool(os.getenv("PYAL_DLL_STATS")))
 
 
 def get_dll_file():
@@ -89,5 +358,21 @@ def get_dll_file():
     return dll.libfile
 
 
+def set_call_stats_enabled(enabled):
+    """Enables or disables the call statistics of the OpenAL functions."""
+    dll.set_instrumented(enabled)
+
+
+def get_call_stats():
+    """Gets the call statistics of the OpenAL functions as dict of function
+    names and CallStats."""
+    return dll.get_stats()
+
+
+def reset_call_stats():
+    """Resets the call statistics of the OpenAL functions."""
+    dll.reset_stats()
+
+
 __version__ = "0.2.0"
 version_info = (0, 2, 0, "")
@@ -46,7 +46,6 @@ __all__ = ["AL_INVALID", "AL_NONE", "AL_TRUE", "AL_FALSE",
            "alDopplerVelocity", "alSpeedOfSound", "alDistanceModel",
            ]
 
-_bind = dll.bind_function
 
 AL_INVALID = -1
 AL_NONE = 0
@@ -146,99 +145,93 @@ ALfloat = ctypes.c_float
 ALdouble = ctypes.c_double
 ALvoid = None
 
-_bind = dll.bind_function
-
-alEnable = _bind("alEnable", [ALenum])
-alDisable = _bind("alDisable", [ALenum])
-alIsEnabled = _bind("alIsEnabled", [ALenum], ALboolean)
-alGetString = _bind("alGetString", [ALenum], ctypes.POINTER(ALchar))
-alGetBooleanv = _bind("alGetBooleanv", [ALenum, ctypes.POINTER(ALboolean)])
-alGetIntegerv = _bind("alGetIntegerv", [ALenum, ctypes.POINTER(ALint)])
-alGetFloatv = _bind("alGetFloatv", [ALenum, ctypes.POINTER(ALfloat)])
-alGetDoublev = _bind("alGetDoublev", [ALenum, ctypes.POINTER(ALdouble)])
-alGetBoolean = _bind("alGetBoolean", [ALenum], ALboolean)
-alGetInteger = _bind("alGetInteger", [ALenum], ALint)
-alGetFloat = _bind("alGetFloat", [ALenum], ALfloat)
-alGetDouble = _bind("alGetDouble", [ALenum], ALdouble)
-alGetError = _bind("alGetError", None, ALenum)
-alIsExtensionPresent = _bind("alIsExtensionPresent",
-                             [ctypes.POINTER(ALchar)], ALboolean)
-alGetProcAddress = _bind("alGetProcAddress",
-                         [ctypes.POINTER(ALchar)], ctypes.c_void_p)
-alGetEnumValue = _bind("alGetEnumValue", [ctypes.POINTER(ALchar)], ALenum)
-alListenerf = _bind("alListenerf", [ALenum, ALfloat])
-alListener3f = _bind("alListener3f", [ALenum, ALfloat, ALfloat, ALfloat])
-alListenerfv = _bind("alListenerfv", [ALenum, ctypes.POINTER(ALfloat)])
-alListeneri = _bind("alListeneri", [ALenum, ALint])
-alListener3i = _bind("alListener3i", [ALenum, ALint, ALint, ALint])
-alListeneriv = _bind("alListeneriv", [ALenum, ctypes.POINTER(ALint)])
-alGetListenerf = _bind("alGetListenerf", [ALenum, ctypes.POINTER(ALfloat)])
-alGetListener3f = _bind("alGetListener3f", [ALenum, ctypes.POINTER(ALfloat),
-                                            ctypes.POINTER(ALfloat),
-                                            ctypes.POINTER(ALfloat)])
-alGetListenerfv = _bind("alGetListenerfv", [ALenum, ctypes.POINTER(ALfloat)])
-alGetListeneri = _bind("alGetListeneri", [ALenum, ctypes.POINTER(ALint)])
-alGetListener3i = _bind("alGetListener3i", [ALenum, ctypes.POINTER(ALint),
-                                            ctypes.POINTER(ALint),
-                                            ctypes.POINTER(ALint)])
-alGetListeneriv = _bind("alGetListeneriv", [ALenum, ctypes.POINTER(ALint)])
-alGenSources = _bind("alGenSources", [ALsizei, ctypes.POINTER(ALuint)])
-alDeleteSources = _bind("alDeleteSources", [ALsizei, ctypes.POINTER(ALuint)])
-alIsSource = _bind("alIsSource", [ALuint], ALboolean)
-alSourcef = _bind("alSourcef", [ALuint, ALenum, ALfloat])
-alSource3f = _bind("alSource3f", [ALuint, ALenum, ALfloat, ALfloat, ALfloat])
-alSourcefv = _bind("alSourcefv", [ALuint, ALenum, ctypes.POINTER(ALfloat)])
-alSourcei = _bind("alSourcei", [ALuint, ALenum, ALint])
-alSource3i = _bind("alSource3i", [ALuint, ALenum, ALint, ALint, ALint])
-alSourceiv = _bind("alSourceiv", [ALuint, ALenum, ctypes.POINTER(ALint)])
-alGetSourcef = _bind("alGetSourcef", [ALuint, ALenum, ctypes.POINTER(ALfloat)])
-alGetSource3f = _bind("alGetSource3f", [ALuint, ALenum, ctypes.POINTER(ALfloat),
-                                        ctypes.POINTER(ALfloat),
-                                        ctypes.POINTER(ALfloat)])
-alGetSourcefv = _bind("alGetSourcefv", [ALuint, ALenum,
-                                        ctypes.POINTER(ALfloat)])
-alGetSourcei = _bind("alGetSourcei", [ALuint, ALenum, ctypes.POINTER(ALint)])
-alGetSource3i = _bind("alGetSource3i", [ALuint, ALenum, ctypes.POINTER(ALint),
-                                        ctypes.POINTER(ALint),
-                                        ctypes.POINTER(ALint)])
-alGetSourceiv = _bind("alGetSourceiv", [ALuint, ALenum, ctypes.POINTER(ALint)])
-alSourcePlayv = _bind("alSourcePlayv", [ALsizei, ctypes.POINTER(ALuint)])
-alSourceStopv = _bind("alSourceStopv", [ALsizei, ctypes.POINTER(ALuint)])
-alSourceRewindv = _bind("alSourceRewindv", [ALsizei, ctypes.POINTER(ALuint)])
-alSourcePausev = _bind("alSourcePausev", [ALsizei, ctypes.POINTER(ALuint)])
-alSourcePlay = _bind("alSourcePlay", [ALuint])
-alSourceStop = _bind("alSourceStop", [ALuint])
-alSourceRewind = _bind("alSourceRewind", [ALuint])
-alSourcePause = _bind("alSourcePause", [ALuint])
-alSourceQueueBuffers = _bind("alSourceQueueBuffers",
-                             [ALuint, ALsizei, ctypes.POINTER(ALuint)])
-alSourceUnqueueBuffers = _bind("alSourceUnqueueBuffers",
-                               [ALuint, ALsizei, ctypes.POINTER(ALuint)])
-alGenBuffers = _bind("alGenBuffers", [ALsizei, ctypes.POINTER(ALuint)])
-alDeleteBuffers = _bind("alDeleteBuffers", [ALsizei, ctypes.POINTER(ALuint)])
-alIsBuffer = _bind("alIsBuffer", [ALuint], ALboolean)
-alBufferData = _bind("alBufferData", [ALuint, ALenum, ctypes.POINTER(ALvoid),
-                                      ALsizei, ALsizei])
-alBufferf = _bind("alBufferf", [ALuint, ALenum, ALfloat])
-alBuffer3f = _bind("alBuffer3f", [ALuint, ALenum, ALfloat, ALfloat, ALfloat])
-alBufferfv = _bind("alBufferfv", [ALuint, ALenum, ctypes.POINTER(ALfloat)])
-alBufferi = _bind("alBufferi", [ALuint, ALenum, ALint])
-alBuffer3i = _bind("alBuffer3i", [ALuint, ALenum, ALint, ALint, ALint])
-alBufferiv = _bind("alBufferiv", [ALuint, ALenum, ctypes.POINTER(ALint)])
-alGetBufferf = _bind("alGetBufferf", [ALuint, ALenum, ctypes.POINTER(ALfloat)])
-alGetBuffer3f = _bind("alGetBuffer3f", [ALuint, ALenum,
-                                        ctypes.POINTER(ALfloat),
-                                        ctypes.POINTER(ALfloat),
-                                        ctypes.POINTER(ALfloat)])
-alGetBufferfv = _bind("alGetBufferfv", [ALuint, ALenum,
-                                        ctypes.POINTER(ALfloat)])
-alGetBufferi = _bind("alGetBufferi", [ALuint, ALenum, ctypes.POINTER(ALint)])
-alGetBuffer3i = _bind("alGetBuffer3i", [ALuint, ALenum,
-                                        ctypes.POINTER(ALint),
-                                        ctypes.POINTER(ALint),
-                                        ctypes.POINTER(ALint)])
-alGetBufferiv = _bind("alGetBufferiv", [ALuint, ALenum, ctypes.POINTER(ALint)])
-alDopplerFactor = _bind("alDopplerFactor", [ALfloat])
-alDopplerVelocity = _bind("alDopplerVelocity", [ALfloat])
-alSpeedOfSound = _bind("alSpeedOfSound", [ALfloat])
-alDistanceModel = _bind("alDistanceModel", [ALenum])
+
+# Function name -> (argument types, return type) of the lazily
+# bound functions, see _DLL.bind_functions().
+_FUNCTIONS = {
+    "alEnable": ([ALenum], None),
+    "alDisable": ([ALenum], None),
+    "alIsEnabled": ([ALenum], ALboolean),
+    "alGetString": ([ALenum], ctypes.POINTER(ALchar)),
+    "alGetBooleanv": ([ALenum, ctypes.POINTER(ALboolean)], None),
+    "alGetIntegerv": ([ALenum, ctypes.POINTER(ALint)], None),
+    "alGetFloatv": ([ALenum, ctypes.POINTER(ALfloat)], None),
+    "alGetDoublev": ([ALenum, ctypes.POINTER(ALdouble)], None),
+    "alGetBoolean": ([ALenum], ALboolean),
+    "alGetInteger": ([ALenum], ALint),
+    "alGetFloat": ([ALenum], ALfloat),
+    "alGetDouble": ([ALenum], ALdouble),
+    "alGetError": (None, ALenum),
+    "alIsExtensionPresent": ([ctypes.POINTER(ALchar)], ALboolean),
+    "alGetProcAddress": ([ctypes.POINTER(ALchar)], ctypes.c_void_p),
+    "alGetEnumValue": ([ctypes.POINTER(ALchar)], ALenum),
+    "alListenerf": ([ALenum, ALfloat], None),
+    "alListener3f": ([ALenum, ALfloat, ALfloat, ALfloat], None),
+    "alListenerfv": ([ALenum, ctypes.POINTER(ALfloat)], None),
+    "alListeneri": ([ALenum, ALint], None),
+    "alListener3i": ([ALenum, ALint, ALint, ALint], None),
+    "alListeneriv": ([ALenum, ctypes.POINTER(ALint)], None),
+    "alGetListenerf": ([ALenum, ctypes.POINTER(ALfloat)], None),
+    "alGetListener3f": ([ALenum, ctypes.POINTER(ALfloat),
+                         ctypes.POINTER(ALfloat),
+                         ctypes.POINTER(ALfloat)], None),
+    "alGetListenerfv": ([ALenum, ctypes.POINTER(ALfloat)], None),
+    "alGetListeneri": ([ALenum, ctypes.POINTER(ALint)], None),
+    "alGetListener3i": ([ALenum, ctypes.POINTER(ALint), ctypes.POINTER(ALint),
+                         ctypes.POINTER(ALint)], None),
+    "alGetListeneriv": ([ALenum, ctypes.POINTER(ALint)], None),
+    "alGenSources": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alDeleteSources": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alIsSource": ([ALuint], ALboolean),
+    "alSourcef": ([ALuint, ALenum, ALfloat], None),
+    "alSource3f": ([ALuint, ALenum, ALfloat, ALfloat, ALfloat], None),
+    "alSourcefv": ([ALuint, ALenum, ctypes.POINTER(ALfloat)], None),
+    "alSourcei": ([ALuint, ALenum, ALint], None),
+    "alSource3i": ([ALuint, ALenum, ALint, ALint, ALint], None),
+    "alSourceiv": ([ALuint, ALenum, ctypes.POINTER(ALint)], None),
+    "alGetSourcef": ([ALuint, ALenum, ctypes.POINTER(ALfloat)], None),
+    "alGetSource3f": ([ALuint, ALenum, ctypes.POINTER(ALfloat),
+                       ctypes.POINTER(ALfloat),
+                       ctypes.POINTER(ALfloat)], None),
+    "alGetSourcefv": ([ALuint, ALenum, ctypes.POINTER(ALfloat)], None),
+    "alGetSourcei": ([ALuint, ALenum, ctypes.POINTER(ALint)], None),
+    "alGetSource3i": ([ALuint, ALenum, ctypes.POINTER(ALint),
+                       ctypes.POINTER(ALint), ctypes.POINTER(ALint)], None),
+    "alGetSourceiv": ([ALuint, ALenum, ctypes.POINTER(ALint)], None),
+    "alSourcePlayv": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alSourceStopv": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alSourceRewindv": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alSourcePausev": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alSourcePlay": ([ALuint], None),
+    "alSourceStop": ([ALuint], None),
+    "alSourceRewind": ([ALuint], None),
+    "alSourcePause": ([ALuint], None),
+    "alSourceQueueBuffers": ([ALuint, ALsizei, ctypes.POINTER(ALuint)], None),
+    "alSourceUnqueueBuffers": ([ALuint, ALsizei,
+                                ctypes.POINTER(ALuint)], None),
+    "alGenBuffers": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alDeleteBuffers": ([ALsizei, ctypes.POINTER(ALuint)], None),
+    "alIsBuffer": ([ALuint], ALboolean),
+    "alBufferData": ([ALuint, ALenum, ctypes.POINTER(ALvoid), ALsizei,
+                      ALsizei], None),
+    "alBufferf": ([ALuint, ALenum, ALfloat], None),
+    "alBuffer3f": ([ALuint, ALenum, ALfloat, ALfloat, ALfloat], None),
+    "alBufferfv": ([ALuint, ALenum, ctypes.POINTER(ALfloat)], None),
+    "alBufferi": ([ALuint, ALenum, ALint], None),
+    "alBuffer3i": ([ALuint, ALenum, ALint, ALint, ALint], None),
+    "alBufferiv": ([ALuint, ALenum, ctypes.POINTER(ALint)], None),
+    "alGetBufferf": ([ALuint, ALenum, ctypes.POINTER(ALfloat)], None),
+    "alGetBuffer3f": ([ALuint, ALenum, ctypes.POINTER(ALfloat),
+                       ctypes.POINTER(ALfloat),
+                       ctypes.POINTER(ALfloat)], None),
+    "alGetBufferfv": ([ALuint, ALenum, ctypes.POINTER(ALfloat)], None),
+    "alGetBufferi": ([ALuint, ALenum, ctypes.POINTER(ALint)], None),
+    "alGetBuffer3i": ([ALuint, ALenum, ctypes.POINTER(ALint),
+                       ctypes.POINTER(ALint), ctypes.POINTER(ALint)], None),
+    "alGetBufferiv": ([ALuint, ALenum, ctypes.POINTER(ALint)], None),
+    "alDopplerFactor": ([ALfloat], None),
+    "alDopplerVelocity": ([ALfloat], None),
+    "alSpeedOfSound": ([ALfloat], None),
+    "alDistanceModel": ([ALenum], None),
+    }
+dll.bind_functions(globals(), _FUNCTIONS)
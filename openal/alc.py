@@ -23,7 +23,6 @@ __all__ = ["ALC_FALSE", "ALC_TRUE", "ALC_INVALID", "ALC_FREQUENCY",
            "alcCaptureStop", "alcCaptureSamples"
            ]
 
-_bind = dll.bind_function
 
 ALC_INVALID = 0
 ALC_FALSE = 0
@@ -84,44 +83,37 @@ class ALCcontext(ctypes.Structure):
     """An execution context on a OpenAL device."""
     pass
 
-alcCreateContext = _bind("alcCreateContext", [ctypes.POINTER(ALCdevice),
-                                              ctypes.POINTER(ALCint)],
-                         ctypes.POINTER(ALCcontext))
-alcMakeContextCurrent = _bind("alcMakeContextCurrent",
-                              [ctypes.POINTER(ALCcontext)], ALCboolean)
-alcProcessContext = _bind("alcProcessContext", [ctypes.POINTER(ALCcontext)])
-alcSuspendContext = _bind("alcSuspendContext", [ctypes.POINTER(ALCcontext)])
-alcDestroyContext = _bind("alcDestroyContext", [ctypes.POINTER(ALCcontext)])
-alcGetCurrentContext = _bind("alcGetCurrentContext", None,
-                             ctypes.POINTER(ALCcontext))
-alcGetContextsDevice = _bind("alcGetContextsDevice",
-                             [ctypes.POINTER(ALCcontext)],
-                             ctypes.POINTER(ALCdevice))
-alcOpenDevice = _bind("alcOpenDevice", [ctypes.POINTER(ALCchar)],
-                      ctypes.POINTER(ALCdevice))
-alcCloseDevice = _bind("alcCloseDevice", [ctypes.POINTER(ALCdevice)],
-                       ALCboolean)
-alcGetError = _bind("alcGetError", [ctypes.POINTER(ALCdevice)], ALCenum)
-alcIsExtensionPresent = _bind("alcIsExtensionPresent",
-                              [ctypes.POINTER(ALCdevice),
-                               ctypes.POINTER(ALCchar)])
-alcGetProcAddress = _bind("alcGetProcAddress", [ctypes.POINTER(ALCdevice),
-                                                ctypes.POINTER(ALCchar)],
-                          ctypes.c_void_p)
-alcGetEnumValue = _bind("alcGetEnumValue", [ctypes.POINTER(ALCdevice),
-                                            ctypes.POINTER(ALCchar)], ALCenum)
-alcGetString = _bind("alcGetString", [ctypes.POINTER(ALCdevice), ALCenum],
-                     ctypes.POINTER(ALCchar))
-alcGetIntegerv = _bind("alcGetIntegerv", [ctypes.POINTER(ALCdevice),
-                                          ALCenum, ALCsizei,
-                                          ctypes.POINTER(ALCint)])
-alcCaptureOpenDevice = _bind("alcCaptureOpenDevice",
-                             [ctypes.POINTER(ALCchar), ALCuint, ALCenum,
-                              ALCsizei], ctypes.POINTER(ALCdevice))
-alcCaptureCloseDevice = _bind("alcCaptureCloseDevice",
-                              [ctypes.POINTER(ALCdevice)])
-alcCaptureStart = _bind("alcCaptureStart", [ctypes.POINTER(ALCdevice)])
-alcCaptureStop = _bind("alcCaptureStop", [ctypes.POINTER(ALCdevice)])
-alcCaptureSamples = _bind("alcCaptureSamples", [ctypes.POINTER(ALCdevice),
-                                                ctypes.POINTER(ALCvoid),
-                                                ALCsizei])
+# Function name -> (argument types, return type) of the lazily
+# bound functions, see _DLL.bind_functions().
+_FUNCTIONS = {
+    "alcCreateContext": ([ctypes.POINTER(ALCdevice),
+                          ctypes.POINTER(ALCint)], ctypes.POINTER(ALCcontext)),
+    "alcMakeContextCurrent": ([ctypes.POINTER(ALCcontext)], ALCboolean),
+    "alcProcessContext": ([ctypes.POINTER(ALCcontext)], None),
+    "alcSuspendContext": ([ctypes.POINTER(ALCcontext)], None),
+    "alcDestroyContext": ([ctypes.POINTER(ALCcontext)], None),
+    "alcGetCurrentContext": (None, ctypes.POINTER(ALCcontext)),
+    "alcGetContextsDevice": ([ctypes.POINTER(ALCcontext)],
+                             ctypes.POINTER(ALCdevice)),
+    "alcOpenDevice": ([ctypes.POINTER(ALCchar)], ctypes.POINTER(ALCdevice)),
+    "alcCloseDevice": ([ctypes.POINTER(ALCdevice)], ALCboolean),
+    "alcGetError": ([ctypes.POINTER(ALCdevice)], ALCenum),
+    "alcIsExtensionPresent": ([ctypes.POINTER(ALCdevice),
+                               ctypes.POINTER(ALCchar)], None),
+    "alcGetProcAddress": ([ctypes.POINTER(ALCdevice),
+                           ctypes.POINTER(ALCchar)], ctypes.c_void_p),
+    "alcGetEnumValue": ([ctypes.POINTER(ALCdevice),
+                         ctypes.POINTER(ALCchar)], ALCenum),
+    "alcGetString": ([ctypes.POINTER(ALCdevice),
+                      ALCenum], ctypes.POINTER(ALCchar)),
+    "alcGetIntegerv": ([ctypes.POINTER(ALCdevice), ALCenum, ALCsizei,
+                        ctypes.POINTER(ALCint)], None),
+    "alcCaptureOpenDevice": ([ctypes.POINTER(ALCchar), ALCuint, ALCenum,
+                              ALCsizei], ctypes.POINTER(ALCdevice)),
+    "alcCaptureCloseDevice": ([ctypes.POINTER(ALCdevice)], None),
+    "alcCaptureStart": ([ctypes.POINTER(ALCdevice)], None),
+    "alcCaptureStop": ([ctypes.POINTER(ALCdevice)], None),
+    "alcCaptureSamples": ([ctypes.POINTER(ALCdevice), ctypes.POINTER(ALCvoid),
+                           ALCsizei], None),
+    }
+dll.bind_functions(globals(), _FUNCTIONS)
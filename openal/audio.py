@@ -1,12 +1,19 @@
 """Utility classes for OpenAL-based audio access."""
-from collections import Iterable
+from collections.abc import Iterable
+from collections import OrderedDict, deque, namedtuple
+import bisect
 import ctypes
+import functools
+import math
 import os
-from . import al, alc
+import threading
+import time
+import weakref
+from . import al, alc, ext, dll
 
 
-__all__ = ["SoundListener", "SoundSource", "SoundData", "SoundSink",
-           "OpenALError",
+__all__ = ["SoundListener", "SoundSource", "SourceArray", "SourceSnapshot",
+           "SoundData", "SoundSink", "SinkStats", "OpenALError",
            ]
 
 
@@ -15,6 +22,171 @@ _to_ctypes = lambda seq, dtype: (len(seq) * dtype)(*seq)
 _to_python = lambda seq: [x.value for x in seq]
 
 
+_clock = time.perf_counter
+
+
+def _handover(func):
+    """Runs the decorated SoundSink method on the SoundSink's update thread,
+    if the thread is running and the method is called from another thread.
+
+    If the update thread stopped due to an exception, the exception is
+    raised instead.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args):
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            if thread.is_alive():
+                self._commands.append((func, args))
+                return None
+            self._join_update_thread()
+        return func(self, *args)
+    return wrapper
+
+
+def _get_running_loop():
+    """Gets the running asyncio event loop.
+
+    Raises a RuntimeError, if no event loop is running in the current
+    thread.
+    """
+    import asyncio
+    # Python versions before 3.7 lack get_running_loop(), but their
+    # get_event_loop() is not deprecated yet.
+    return getattr(asyncio, "get_running_loop", asyncio.get_event_loop)()
+
+
+def _resolve_future(loop, future, result=None):
+    """Sets the result of the asyncio future on its event loop, which is
+    safe to be called from any thread."""
+    def _set_result():
+        if not future.done():
+            future.set_result(result)
+    loop.call_soon_threadsafe(_set_result)
+
+
+# Bytes per sample frame of the OpenAL formats
+_FORMATFRAMESIZES = {
+    al.AL_FORMAT_MONO8: 1,
+    al.AL_FORMAT_MONO16: 2,
+    al.AL_FORMAT_STEREO8: 2,
+    al.AL_FORMAT_STEREO16: 4,
+    ext.AL_FORMAT_MONO_FLOAT32: 4,
+    ext.AL_FORMAT_STEREO_FLOAT32: 8,
+    }
+
+# (channels, sample type name) <-> OpenAL format mappings for array data
+_ARRAYFORMATS = {
+    (1, "uint8"): al.AL_FORMAT_MONO8,
+    (2, "uint8"): al.AL_FORMAT_STEREO8,
+    (1, "int16"): al.AL_FORMAT_MONO16,
+    (2, "int16"): al.AL_FORMAT_STEREO16,
+    (1, "float32"): ext.AL_FORMAT_MONO_FLOAT32,
+    (2, "float32"): ext.AL_FORMAT_STEREO_FLOAT32,
+    }
+_ARRAYTYPES = dict((v, k[1]) for k, v in _ARRAYFORMATS.items())
+
+
+def _convert_samples(arr, dtype):
+    """Converts a numpy array of uint8, int16 or floating point samples
+    to the passed uint8, int16 or float32 sample type."""
+    import numpy
+    src, dst = arr.dtype, numpy.dtype(dtype)
+    if src == dst:
+        return arr
+    if dst.name not in ("uint8", "int16", "float32"):
+        raise ValueError("unsupported sample type %s" % dst)
+    if src == numpy.uint8 and dst == numpy.int16:
+        return (arr.astype(numpy.int16) - 128) << 8
+    if src == numpy.int16 and dst == numpy.uint8:
+        return ((arr >> 8) + 128).astype(numpy.uint8)
+    # Everything else goes through float32 samples in the range [-1, 1]
+    if src == numpy.uint8:
+        samples = (arr.astype(numpy.float32) - 128) / 128
+    elif src == numpy.int16:
+        samples = arr.astype(numpy.float32) / 32768
+    elif src.kind == "f":
+        samples = arr.astype(numpy.float32)
+    else:
+        raise ValueError("unsupported sample type %s" % src)
+    if dst == numpy.float32:
+        return samples
+    if dst == numpy.int16:
+        return numpy.clip(samples * 32768, -32768, 32767).astype(numpy.int16)
+    return numpy.clip(samples * 128 + 128, 0, 255).astype(numpy.uint8)
+
+
+class _Py_buffer(ctypes.Structure):
+    """The Py_buffer structure of the CPython buffer protocol."""
+    _fields_ = [("buf", ctypes.c_void_p),
+                ("obj", ctypes.c_void_p),
+                ("len", ctypes.c_ssize_t),
+                ("itemsize", ctypes.c_ssize_t),
+                ("readonly", ctypes.c_int),
+                ("ndim", ctypes.c_int),
+                ("format", ctypes.c_char_p),
+                ("shape", ctypes.c_void_p),
+                ("strides", ctypes.c_void_p),
+                ("suboffsets", ctypes.c_void_p),
+                ("internal", ctypes.c_void_p),
+                ]
+
+
+def _get_buffer_address(view):
+    """Gets the memory address of a read-only memoryview."""
+    pythonapi = getattr(ctypes, "pythonapi", None)
+    if pythonapi is None:
+        # Not a CPython implementation, so copy it.
+        return view.tobytes()
+    pybuf = _Py_buffer()
+    if pythonapi.PyObject_GetBuffer(ctypes.py_object(view),
+                                    ctypes.byref(pybuf), 0) != 0:
+        return view.tobytes()
+    # The view keeps the memory alive, while it is in use.
+    address = pybuf.buf
+    pythonapi.PyBuffer_Release(ctypes.byref(pybuf))
+    return address
+
+
+def _get_buffer_size(data):
+    """Gets the size in bytes of a buffer protocol object."""
+    if isinstance(data, bytes):
+        return len(data)
+    return memoryview(data).nbytes
+
+
+def _buffer_data(bufid, dformat, data, size, frequency):
+    """Uploads PCM data to an OpenAL buffer.
+
+    data can be any C-contiguous buffer protocol object, which is passed to
+    OpenAL without copying it. If size is None, the whole data is uploaded.
+    Returns the amount of uploaded bytes.
+    """
+    if isinstance(data, bytes):
+        view = None
+        pointer = data
+        nbytes = len(data)
+    else:
+        view = memoryview(data)
+        if not view.c_contiguous:
+            raise ValueError("PCM data must be a C-contiguous buffer")
+        view = view.cast("B")
+        nbytes = view.nbytes
+        if view.readonly:
+            pointer = _get_buffer_address(view)
+        else:
+            pointer = (ctypes.c_char * nbytes).from_buffer(view)
+    if size is None:
+        size = nbytes
+    if size > nbytes:
+        raise ValueError("size exceeds the length of the PCM data")
+    framesize = _FORMATFRAMESIZES.get(dformat, 1)
+    if size % framesize != 0:
+        raise ValueError("size is not a multiple of the sample frame size")
+    al.alBufferData(bufid, dformat, pointer, size, frequency)
+    return size
+
+
 # Error handling
 _ERRMAP = {al.AL_NO_ERROR: "No Error",
            al.AL_INVALID_NAME: "Invalid name",
@@ -30,6 +202,7 @@ _ERRMAP = {al.AL_NO_ERROR: "No Error",
            alc.ALC_OUT_OF_MEMORY: "Out of memory"
            }
 _get_error_message = lambda x: _ERRMAP.get(x, "Error code [%d]" % x)
+_ERRORMODES = ("strict", "deferred", "off")
 
 
 def _continue_or_raise(alcdevice=None):
@@ -44,6 +217,11 @@ def _continue_or_raise(alcdevice=None):
             raise OpenALError(_get_error_message(err))
 
 
+def _ignore_errors():
+    """Does not check for errors."""
+    pass
+
+
 # Property update handling on SoundListener, SoundData and SoundSource
 _SOURCEPROPMAP = {
     "pitch": al.AL_PITCH,
@@ -145,15 +323,24 @@ _LISTENERCALLBACKS = {
         al.AL_VELOCITY: (3, al.ALfloat, al.alListenerfv, al.alGetListenerfv),
         al.AL_ORIENTATION: (6, al.ALfloat, al.alListenerfv, al.alGetListenerfv),
         }
-def _get_listener_value(prop):
-    """Gets the requested OpenAL listener property value."""
+def _get_listener_value(prop, out=None):
+    """Gets the requested OpenAL listener property value.
+
+    If out is passed, the value is stored in and returned as out instead of
+    a new ctypes array.
+    """
     size, _Type, setter, getter = _LISTENERCALLBACKS[prop]
-    v = (_Type * size)()
-    getter(prop, v)
-    return v
+    if out is None:
+        out = (_Type * size)()
+    getter(prop, out)
+    return out
 def _set_listener_value(prop, value):
     """Sets a OpenAL listener property value."""
     size, _Type, setter, getter = _LISTENERCALLBACKS[prop]
+    if size == 3 and setter is al.alListenerfv:
+        # Pass vectors as plain values instead of building a ctypes array.
+        al.alListener3f(prop, value[0], value[1], value[2])
+        return
     if size > 1:
         value = _to_ctypes(value, _Type)
     setter(prop, value)
@@ -177,6 +364,7 @@ def add_listener_extension(propname, proptype, vcount, valuetype, getter,
     global _LISTENERPROPMAP
     _LISTENERCALLBACKS[proptype] = (vcount, valuetype, getter, setter)
     _LISTENERPROPMAP[propname] = proptype
+    setattr(SoundListener, propname, _Property(proptype))
     return True
 
 
@@ -204,15 +392,57 @@ _SOURCECALLBACKS = {
         al.AL_SAMPLE_OFFSET: (1, al.ALfloat, al.alSourcef, al.alGetSourcef),
         al.AL_BYTE_OFFSET: (1, al.ALfloat, al.alSourcef, al.alGetSourcef),
         }
-def _get_source_value(sourceid, prop):
-    """Gets the requested OpenAL source property value."""
+
+
+def _rebind_callbacks():
+    """Replaces the AL functions of the callback tables by the currently
+    bound ones, after they were bound again on toggling the call statistics.
+    """
+    for table in (_BUFFERCALLBACKS, _LISTENERCALLBACKS, _SOURCECALLBACKS):
+        for prop, entry in table.items():
+            table[prop] = tuple(getattr(al, value.__name__)
+                                if getattr(value, "__name__", None) in
+                                al._FUNCTIONS else value for value in entry)
+dll.add_rebind_hook(_rebind_callbacks)
+
+
+# The OpenAL 1.1 default values of the settable source properties, which
+# are restored, before a source id is handed out to another SoundSource.
+_SOURCEDEFAULTS = {
+        al.AL_PITCH: 1.0,
+        al.AL_GAIN: 1.0,
+        al.AL_MAX_DISTANCE: 3.4028234663852886e+38,
+        al.AL_ROLLOFF_FACTOR: 1.0,
+        al.AL_REFERENCE_DISTANCE: 1.0,
+        al.AL_MIN_GAIN: 0.0,
+        al.AL_MAX_GAIN: 1.0,
+        al.AL_CONE_OUTER_GAIN: 0.0,
+        al.AL_CONE_INNER_ANGLE: 360.0,
+        al.AL_CONE_OUTER_ANGLE: 360.0,
+        al.AL_POSITION: [0, 0, 0],
+        al.AL_VELOCITY: [0, 0, 0],
+        al.AL_DIRECTION: [0, 0, 0],
+        al.AL_SOURCE_RELATIVE: al.AL_FALSE,
+        al.AL_LOOPING: al.AL_FALSE,
+        }
+def _get_source_value(sourceid, prop, out=None):
+    """Gets the requested OpenAL source property value.
+
+    If out is passed, the value is stored in and returned as out instead of
+    a new ctypes array.
+    """
     size, _Type, setter, getter = _SOURCECALLBACKS[prop]
-    v = (_Type * size)()
-    getter(sourceid, prop, v)
-    return v
+    if out is None:
+        out = (_Type * size)()
+    getter(sourceid, prop, out)
+    return out
 def _set_source_value(sourceid, prop, value):
     """Sets a OpenAL source property value."""
     size, _Type, setter, getter = _SOURCECALLBACKS[prop]
+    if size == 3 and setter is al.alSourcefv:
+        # Pass vectors as plain values instead of building a ctypes array.
+        al.alSource3f(sourceid, prop, value[0], value[1], value[2])
+        return
     if size > 1:
         value = _to_ctypes(value, _Type)
     setter(sourceid, prop, value)
@@ -235,6 +465,7 @@ def add_source_extension(propname, proptype, vcount, valuetype, getter, setter):
     global _SOURCEPROPMAP
     _SOURCECALLBACKS[proptype] = (vcount, valuetype, getter, setter)
     _SOURCEPROPMAP[propname] = proptype
+    setattr(SoundSource, propname, _Property(proptype))
     return True
 
 
@@ -267,10 +498,18 @@ class SoundData(object):
 
     The SoundData consists of a PCM audio data buffer, the audio frequency
     and additional format information to allow easy buffering through OpenAL.
+    The data can be any C-contiguous buffer protocol object, such as bytes,
+    bytearray, memoryview, array.array or mmap objects, which is passed to
+    OpenAL without copying it.
     """
     def __init__(self, data=None, channels=None, bitrate=None, size=None,
                  frequency=None, dformat=None):
-        """Creates a new SoundData object."""
+        """Creates a new SoundData object.
+
+        If no size is passed, the size of the data buffer will be used.
+        """
+        if size is None and data is not None:
+            size = _get_buffer_size(data)
         self.channels = channels
         self.bitrate = bitrate
         self.size = size
@@ -285,6 +524,59 @@ class SoundData(object):
             dformat = formatmap.get((channels, bitrate), None)
         self.format = dformat
 
+    @classmethod
+    def from_array(cls, arr, frequency, dtype=None):
+        """Creates a new SoundData from a numpy array.
+
+        The array can be a 1-dimensional array of mono samples or a
+        2-dimensional (frames, channels) array of mono or stereo samples.
+        uint8, int16 and float32 samples are used as they are, float64
+        samples are converted to float32. If a dtype is passed, the samples
+        are converted to it.
+
+        float32 samples require the AL_EXT_float32 extension.
+        """
+        import numpy
+        arr = numpy.asarray(arr)
+        if arr.ndim == 1:
+            channels = 1
+        elif arr.ndim == 2:
+            channels = arr.shape[1]
+        else:
+            raise ValueError("array must be 1- or 2-dimensional")
+        if dtype is None:
+            dtype = arr.dtype
+            if dtype.kind == "f":
+                dtype = numpy.float32
+        arr = numpy.ascontiguousarray(_convert_samples(arr, dtype))
+        dformat = _ARRAYFORMATS.get((channels, arr.dtype.name), None)
+        if dformat is None:
+            raise ValueError("unsupported sample format: %d channels of %s"
+                             % (channels, arr.dtype))
+        return cls(arr, channels, arr.dtype.itemsize * 8, arr.nbytes,
+                   frequency, dformat)
+
+    def as_array(self, dtype=None):
+        """Gets the PCM data as numpy array.
+
+        Mono data is returned as 1-dimensional array, stereo data as
+        (frames, 2) array. Without a dtype, the array shares the memory of
+        the data. Otherwise the samples are converted to the passed uint8,
+        int16 or float32 dtype.
+        """
+        import numpy
+        sampletype = _ARRAYTYPES.get(self.format, None)
+        if sampletype is None:
+            raise ValueError("unsupported sample format")
+        itemsize = numpy.dtype(sampletype).itemsize
+        arr = numpy.frombuffer(self.data, dtype=sampletype,
+                               count=self.size // itemsize)
+        if self.channels > 1:
+            arr = arr.reshape(-1, self.channels)
+        if dtype is not None:
+            arr = _convert_samples(arr, dtype)
+        return arr
+
 
 class StreamingSoundData(SoundData):
     """A streaming audio object.
@@ -296,8 +588,9 @@ class StreamingSoundData(SoundData):
     def __init__(self, stream=None, channels=None, bitrate=None, size=None,
                  frequency=None):
         """Creates a new StreamingSoundData object."""
-        super(StreamingSoundData, self).__init__(stream, channels, bitrate,
+        super(StreamingSoundData, self).__init__(None, channels, bitrate,
                                                  size, frequency)
+        self.data = stream
         self.streaming = True
 
     def read(self, size=None):
@@ -310,8 +603,60 @@ class StreamingSoundData(SoundData):
         return self.data.tell()
 
 
+class _Property(object):
+    """Maps an attribute of a SoundListener or SoundSource to an OpenAL
+    property.
+
+    The value is stored in the dataproperties of the object and the
+    property is marked as changed on assignment.
+    """
+    __slots__ = ("prop",)
+
+    def __init__(self, prop):
+        self.prop = prop
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        # Either get the value or return None, if it has not been
+        # fetched yet.
+        return obj.dataproperties.get(self.prop, None)
+
+    def __set__(self, obj, value):
+        obj.dataproperties[self.prop] = value
+        obj._changed.add(self.prop)
+        observer = obj._observer
+        if observer is not None:
+            observer.add(obj)
+
+    def __delete__(self, obj):
+        obj.dataproperties.pop(self.prop, None)
+
+
+def _pop_changes(obj):
+    """Yields the changed properties of the SoundSource or SoundListener and
+    removes them from its changedproperties.
+
+    The properties are popped one by one instead of swapping the set, so
+    that properties changed by other threads meanwhile are either yielded
+    or kept for the next call.
+    """
+    changed = obj.changedproperties
+    while changed:
+        yield changed.pop()
+
+
+def _add_properties(cls, propmap):
+    """Creates the attributes for the OpenAL properties of propmap on the
+    passed class."""
+    for name, prop in propmap.items():
+        setattr(cls, name, _Property(prop))
+
+
 class SoundListener(object):
     """A listener object within the 3D audio space."""
+    __slots__ = ("dataproperties", "_changed", "_observer", "__weakref__")
+
     def __init__(self, position=[0, 0, 0], velocity=[0, 0, 0],
                  orientation=[0, 0, -1, 0, 1, 0]):
         """Creates a new SoundListener with a specific position, movement
@@ -320,100 +665,532 @@ class SoundListener(object):
         self.dataproperties[al.AL_POSITION] = position
         self.dataproperties[al.AL_VELOCITY] = velocity
         self.dataproperties[al.AL_ORIENTATION] = orientation
-        self.changedproperties = [al.AL_POSITION, al.AL_VELOCITY,
-                                  al.AL_ORIENTATION]
-
-    def __getattr__(self, name):
-        if name in ("dataproperties", "changedproperties"):
-            return super(SoundListener, self).__getattr__(name)
-        dprop = _LISTENERPROPMAP.get(name, None)
-        if dprop is None:
-            raise AttributeError("object %r has no attribute %r" % \
-                                     (self.__class__.__name__, name))
-        # Either get the value or return None, if it has not been
-        # fetched yet.
-        return self.dataproperties.get(dprop, None)
-
-    def __setattr__(self, name, value):
-        if name in ("dataproperties", "changedproperties"):
-            return super(SoundListener, self).__setattr__(name, value)
-        dprop = _LISTENERPROPMAP.get(name, None)
-        if dprop is None:
-            raise AttributeError("object %r has no attribute %r" % \
-                                     (self.__class__.__name__, name))
-        self.dataproperties[dprop] = value
-        if dprop not in self.changedproperties:
-            self.changedproperties.append(dprop)
-
-    def __delattr__(self, name):
-        if name in ("dataproperties", "changedproperties"):
-            return super(SoundListener, self).__delattr__(name)
-        dprop = _LISTENERPROPMAP.get(name, None)
-        if dprop is None:
-            raise AttributeError("object %r has no attribute %r" % \
-                                     (self.__class__.__name__, name))
-        self.dataproperties.pop(dprop, None)
+        self._changed = set((al.AL_POSITION, al.AL_VELOCITY,
+                             al.AL_ORIENTATION))
+        self._observer = None
+
+    @property
+    def changedproperties(self):
+        """Gets or sets the set of properties, which changed since the last
+        update."""
+        return self._changed
+
+    @changedproperties.setter
+    def changedproperties(self, value):
+        self._changed = set(value)
+        observer = self._observer
+        if observer is not None and self._changed:
+            observer.add(self)
 
     @property
     def changed(self):
         """Indicates, if one or more properties changed since the last
         update."""
-        return len(self.changedproperties) != 0
+        return len(self._changed) != 0
 
 
 class SoundSource(object):
     """An object within the application world, which can emit sounds."""
+    __slots__ = ("bufferqueue", "dataproperties", "priority", "_changed",
+                 "_observer", "__weakref__")
+
     def __init__(self, gain=1.0, pitch=1.0, position=[0, 0, 0],
-                 velocity=[0, 0, 0]):
+                 velocity=[0, 0, 0], priority=0):
         self.bufferqueue = []
+        self.priority = priority
         self.dataproperties = {}
         self.dataproperties[al.AL_GAIN] = gain
         self.dataproperties[al.AL_PITCH] = pitch
         self.dataproperties[al.AL_POSITION] = position
         self.dataproperties[al.AL_VELOCITY] = velocity
-        self.changedproperties = [al.AL_GAIN, al.AL_PITCH, al.AL_POSITION,
-                                  al.AL_VELOCITY]
-
-    def __getattr__(self, name):
-        if name in ("dataproperties", "changedproperties", "bufferqueue"):
-            return super(SoundSource, self).__getattr__(name)
-        dprop = _SOURCEPROPMAP.get(name, None)
-        if dprop is None:
-            raise AttributeError("object %r has no attribute %r" % \
-                                     (self.__class__.__name__, name))
-        # Either get the value or return None, if it has not been
-        # fetched yet.
-        return self.dataproperties.get(dprop, None)
-
-    def __setattr__(self, name, value):
-        if name in ("dataproperties", "changedproperties", "bufferqueue"):
-            return super(SoundSource, self).__setattr__(name, value)
-        dprop = _SOURCEPROPMAP.get(name, None)
-        if dprop is None:
-            raise AttributeError("object %r has no attribute %r" % \
-                                     (self.__class__.__name__, name))
-        self.dataproperties[dprop] = value
-        if dprop not in self.changedproperties:
-            self.changedproperties.append(dprop)
-
-    def __delattr__(self, name):
-        if name in ("dataproperties", "changedproperties", "bufferqueue"):
-            return super(SoundSource, self).__delattr__(name)
-        dprop = _SOURCEPROPMAP.get(name, None)
-        if dprop is None:
-            raise AttributeError("object %r has no attribute %r" % \
-                                     (self.__class__.__name__, name))
-        self.dataproperties.pop(dprop, None)
+        self._changed = set((al.AL_GAIN, al.AL_PITCH, al.AL_POSITION,
+                             al.AL_VELOCITY))
+        # The set of the SoundSink to report property changes to
+        self._observer = None
+
+    @property
+    def changedproperties(self):
+        """Gets or sets the set of properties, which changed since the last
+        update."""
+        return self._changed
+
+    @changedproperties.setter
+    def changedproperties(self, value):
+        self._changed = set(value)
+        observer = self._observer
+        if observer is not None and self._changed:
+            observer.add(self)
 
     @property
     def changed(self):
         """Indicates, that one or more properties changed since the last
         update."""
-        return len(self.changedproperties) != 0
+        return len(self._changed) != 0
 
     def queue(self, sounddata):
         """Adds a SoundData object for playback to the SoundSource."""
         self.bufferqueue.append(sounddata)
+        observer = self._observer
+        if observer is not None:
+            observer.add(self)
+
+
+_add_properties(SoundListener, _LISTENERPROPMAP)
+_add_properties(SoundSource, _SOURCEPROPMAP)
+
+
+def _changed_rows(current, previous, width):
+    """Gets the indices of the rows of width float32 values, which differ
+    between both ctypes arrays."""
+    rowsize = width * 4
+    size = ctypes.sizeof(current)
+    if ctypes.string_at(current, size) == ctypes.string_at(previous, size):
+        return []
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    if numpy is not None:
+        # Compare the bit patterns, so that NaN values are not considered
+        # to be changed all the time.
+        cur = numpy.frombuffer(current, numpy.uint32).reshape(-1, width)
+        prev = numpy.frombuffer(previous, numpy.uint32).reshape(-1, width)
+        return numpy.flatnonzero((cur != prev).any(axis=1)).tolist()
+    cur = memoryview(current).cast("B")
+    prev = memoryview(previous).cast("B")
+    return [row for row, offset in enumerate(range(0, len(cur), rowsize))
+            if cur[offset:offset + rowsize] != prev[offset:offset + rowsize]]
+
+
+class SourceArray(object):
+    """A group of SoundSource objects, whose position, velocity, gain and
+    pitch are kept in contiguous float32 arrays.
+
+    The arrays are exposed as writable memoryviews, which can be modified
+    in place, e.g. via numpy.asarray(). When the SourceArray is played, the
+    SoundSink passes only the rows, which changed since the last update, to
+    OpenAL.
+    """
+    # OpenAL property -> values per source
+    _PROPERTIES = ((al.AL_POSITION, 3), (al.AL_VELOCITY, 3), (al.AL_GAIN, 1),
+                   (al.AL_PITCH, 1))
+
+    def __init__(self, count, gain=1.0, pitch=1.0):
+        """Creates a new SourceArray with count sources."""
+        if count <= 0:
+            raise ValueError("count must be greater than 0")
+        self.sources = []
+        for index in range(count):
+            source = SoundSource()
+            # Those are managed by the arrays
+            source.dataproperties.clear()
+            source.changedproperties = ()
+            self.sources.append(source)
+        initial = {al.AL_GAIN: gain, al.AL_PITCH: pitch}
+        self._values = {}
+        self._sent = {}
+        self._snapshots = {}
+        for prop, width in self._PROPERTIES:
+            self._values[prop] = (ctypes.c_float * (count * width))()
+            self._sent[prop] = (ctypes.c_float * (count * width))()
+            self._snapshots[prop] = (ctypes.c_float * (count * width))()
+            if prop in initial:
+                for index in range(count):
+                    self._values[prop][index] = initial[prop]
+        self._views = {}
+        for prop, width in self._PROPERTIES:
+            view = memoryview(self._values[prop]).cast("B")
+            if width > 1:
+                view = view.cast("f", (count, width))
+            else:
+                view = view.cast("f")
+            self._views[prop] = view
+        # Rows, whose values have to be passed completely to OpenAL, since
+        # their SoundSource got a new OpenAL source.
+        self._stale = set()
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __getitem__(self, index):
+        return self.sources[index]
+
+    def __iter__(self):
+        return iter(self.sources)
+
+    @property
+    def position(self):
+        """The (count, 3) float32 positions of the sources."""
+        return self._views[al.AL_POSITION]
+
+    @property
+    def velocity(self):
+        """The (count, 3) float32 velocities of the sources."""
+        return self._views[al.AL_VELOCITY]
+
+    @property
+    def gain(self):
+        """The float32 gains of the sources."""
+        return self._views[al.AL_GAIN]
+
+    @property
+    def pitch(self):
+        """The float32 pitches of the sources."""
+        return self._views[al.AL_PITCH]
+
+    def _changes(self):
+        """Gets the changed rows since the last call.
+
+        Yields the OpenAL property, the values per row, the values and the
+        indices of the changed rows.
+        """
+        stale = self._stale
+        self._stale = set()
+        for prop, width in self._PROPERTIES:
+            # Work on a copy, so that values written meanwhile are detected
+            # on the next call.
+            snapshot = self._snapshots[prop]
+            ctypes.memmove(snapshot, self._values[prop],
+                           ctypes.sizeof(snapshot))
+            rows = _changed_rows(snapshot, self._sent[prop], width)
+            if stale:
+                rows = sorted(stale.union(rows))
+            self._snapshots[prop] = self._sent[prop]
+            self._sent[prop] = snapshot
+            if rows:
+                yield prop, width, snapshot, rows
+
+
+class SourceSnapshot(object):
+    """The playback states of a set of SoundSource objects.
+
+    The values are kept in preallocated ctypes arrays, which are exposed as
+    memoryviews and can be wrapped via numpy.asarray() without copying. The
+    rows correspond to the sources list.
+    """
+    # attribute -> (OpenAL property, ctypes type)
+    _FIELDS = (("source_state", al.AL_SOURCE_STATE, al.ALint),
+               ("sec_offset", al.AL_SEC_OFFSET, al.ALfloat),
+               ("buffers_queued", al.AL_BUFFERS_QUEUED, al.ALint),
+               ("buffers_processed", al.AL_BUFFERS_PROCESSED, al.ALint))
+
+    def __init__(self, capacity=0):
+        """Creates a new SourceSnapshot with room for capacity sources."""
+        self.sources = []
+        self._arrays = {}
+        self._capacity = -1
+        self._reserve(capacity)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def _reserve(self, count):
+        """Makes sure that the arrays can keep count rows."""
+        if count <= self._capacity:
+            return
+        count = max(count, 2 * self._capacity, 1)
+        for name, prop, _Type in self._FIELDS:
+            self._arrays[name] = (_Type * count)()
+        self._capacity = count
+
+    def _view(self, name):
+        view = memoryview(self._arrays[name]).cast("B")
+        view = view.cast("f" if name == "sec_offset" else "i")
+        return view[:len(self.sources)]
+
+    @property
+    def source_state(self):
+        """The AL_SOURCE_STATE values of the sources."""
+        return self._view("source_state")
+
+    @property
+    def sec_offset(self):
+        """The AL_SEC_OFFSET values of the sources."""
+        return self._view("sec_offset")
+
+    @property
+    def buffers_queued(self):
+        """The AL_BUFFERS_QUEUED values of the sources."""
+        return self._view("buffers_queued")
+
+    @property
+    def buffers_processed(self):
+        """The AL_BUFFERS_PROCESSED values of the sources."""
+        return self._view("buffers_processed")
+
+
+def _get_duration(sounddata):
+    """Gets the playback duration of the SoundData in seconds."""
+    framesize = _FORMATFRAMESIZES.get(sounddata.format, 0)
+    if not framesize or not sounddata.frequency or not sounddata.size:
+        return 0.0
+    return float(sounddata.size) / (framesize * sounddata.frequency)
+
+
+def _estimate_audibility(source, listenerpos):
+    """Estimates the gain of the SoundSource at the listener position based
+    on the inverse distance clamped model of OpenAL."""
+    props = source.dataproperties
+    gain = props.get(al.AL_GAIN, None)
+    if gain is None:
+        gain = 1.0
+    position = props.get(al.AL_POSITION, None) or (0, 0, 0)
+    if not props.get(al.AL_SOURCE_RELATIVE, False):
+        position = [pos - lpos for pos, lpos in zip(position, listenerpos)]
+    distance = math.sqrt(sum(pos * pos for pos in position))
+    refdistance = props.get(al.AL_REFERENCE_DISTANCE, None) or 1.0
+    rolloff = props.get(al.AL_ROLLOFF_FACTOR, None)
+    if rolloff is None:
+        rolloff = 1.0
+    maxdistance = props.get(al.AL_MAX_DISTANCE, None)
+    if maxdistance is not None:
+        distance = min(distance, maxdistance)
+    distance = max(distance, refdistance)
+    divisor = refdistance + rolloff * (distance - refdistance)
+    if divisor <= 0:
+        return gain
+    return gain * refdistance / divisor
+
+
+def _get_max_distance(source):
+    """Gets the max_distance of the SoundSource."""
+    distance = source.dataproperties.get(al.AL_MAX_DISTANCE, None)
+    if distance is None:
+        return float("inf")
+    return distance
+
+
+class _SpatialGrid(object):
+    """A uniform grid of cubic cells, which indexes objects by their
+    position."""
+    def __init__(self, cellsize):
+        self.cellsize = cellsize
+        # cell -> set of objects
+        self._cells = {}
+        # object -> (cell, position)
+        self._entries = {}
+
+    def __contains__(self, obj):
+        return obj in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def move(self, obj, position):
+        """Adds the object at the position or moves it there."""
+        size = self.cellsize
+        x, y, z = (float(pos) for pos in position)
+        cell = (int(math.floor(x / size)), int(math.floor(y / size)),
+                int(math.floor(z / size)))
+        entry = self._entries.get(obj, None)
+        if entry is not None and entry[0] != cell:
+            self._discard(obj, entry[0])
+            entry = None
+        if entry is None:
+            self._cells.setdefault(cell, set()).add(obj)
+        self._entries[obj] = (cell, (x, y, z))
+
+    def remove(self, obj):
+        """Removes the object from the grid, if it is indexed."""
+        entry = self._entries.pop(obj, None)
+        if entry is not None:
+            self._discard(obj, entry[0])
+
+    def _discard(self, obj, cell):
+        objs = self._cells[cell]
+        objs.discard(obj)
+        if not objs:
+            del self._cells[cell]
+
+    def query(self, position, radius, getradius=None):
+        """Gets the objects within the radius around the position.
+
+        If getradius is passed, it is called with each object and can
+        return a smaller radius to use for it.
+        """
+        size = self.cellsize
+        x, y, z = (float(pos) for pos in position)
+        cx, cy, cz = (int(math.floor(x / size)), int(math.floor(y / size)),
+                      int(math.floor(z / size)))
+        reach = int(math.ceil(radius / size))
+        cells = self._cells
+        entries = self._entries
+        result = []
+        for ix in range(cx - reach, cx + reach + 1):
+            for iy in range(cy - reach, cy + reach + 1):
+                for iz in range(cz - reach, cz + reach + 1):
+                    objs = cells.get((ix, iy, iz), None)
+                    if not objs:
+                        continue
+                    for obj in objs:
+                        ox, oy, oz = entries[obj][1]
+                        dist = (ox - x) ** 2 + (oy - y) ** 2 + (oz - z) ** 2
+                        maxdist = radius
+                        if getradius is not None:
+                            maxdist = min(radius, getradius(obj))
+                        if dist <= maxdist * maxdist:
+                            result.append(obj)
+        return result
+
+
+class _VirtualVoice(object):
+    """The playback state of a SoundSource, which has no OpenAL source.
+
+    entries are the queued SoundData objects, offset is the playback
+    position in seconds within the first one and state is the AL source
+    state.
+    """
+    __slots__ = ("entries", "offset", "state")
+
+    def __init__(self, entries=(), offset=0.0, state=al.AL_INITIAL):
+        self.entries = deque(entries)
+        self.offset = offset
+        self.state = state
+
+
+class _NamePool(object):
+    """A free list of OpenAL object names, e.g. source or buffer ids.
+
+    Names are allocated in blocks via the passed generate callable, which
+    receives the amount of names to create and returns them as sequence. If
+    a maxsize is set, trim() passes the least recently released names, that
+    exceed it, to the delete callable.
+    """
+    def __init__(self, generate, blocksize, delete=None, maxsize=None):
+        self._generate = generate
+        self._delete = delete
+        self._free = []
+        self.blocksize = blocksize
+        self.maxsize = maxsize
+        self.size = 0
+
+    def __len__(self):
+        return len(self._free)
+
+    def reserve(self, count):
+        """Allocates count new names at once and puts them on the free
+        list."""
+        names = self._generate(count)
+        self._free.extend(names)
+        self.size += len(names)
+
+    def acquire(self):
+        """Gets a free name, allocating a new block of names, if necessary."""
+        if len(self._free) == 0:
+            self.reserve(self.blocksize)
+        return self._free.pop()
+
+    def release(self, name):
+        """Puts the name back on the free list."""
+        self._free.append(name)
+
+    def trim(self):
+        """Deletes the free names exceeding the maxsize of the pool."""
+        if self.maxsize is None:
+            return
+        excess = len(self._free) - self.maxsize
+        if excess > 0:
+            names = self._free[:excess]
+            del self._free[:excess]
+            self._delete(names)
+            self.size -= excess
+
+
+class _BufferCache(object):
+    """Keeps track of the OpenAL buffers SoundData objects were uploaded to.
+
+    Each SoundData is uploaded only once. Its buffer is kept, until the
+    SoundData is garbage-collected or evicted from the cache and no source
+    has it queued anymore.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        # weakref(SoundData) -> buffer id, least recently used first
+        self._entries = OrderedDict()
+        # buffer id -> number of times it is queued on sources
+        self._refcount = {}
+        # buffer ids, which are not cached anymore, but still queued
+        self._orphans = set()
+        # weak references of collected SoundData objects
+        self._collected = []
+
+    def __contains__(self, bufid):
+        return bufid in self._refcount
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, sounddata):
+        """Gets the buffer id of the SoundData or None, if it is not
+        cached."""
+        key = weakref.ref(sounddata)
+        bufid = self._entries.get(key, None)
+        if bufid is not None:
+            # Keep the original key, which carries the collection callback.
+            self._entries.move_to_end(key)
+        return bufid
+
+    def add(self, sounddata, bufid):
+        """Adds the buffer id for the SoundData to the cache."""
+        # The callback only records the dead reference, the entry itself
+        # is removed in purge(), so that the OrderedDict is never
+        # modified from within the garbage collector.
+        key = weakref.ref(sounddata, self._collected.append)
+        self._entries[key] = bufid
+        self._refcount[bufid] = 0
+
+    def acquire(self, bufid):
+        """Marks the buffer as being queued on a source."""
+        self._refcount[bufid] += 1
+
+    def release(self, bufid):
+        """Marks the buffer as being unqueued from a source.
+
+        Returns True, if the buffer is not cached anymore and can be
+        deleted, False otherwise.
+        """
+        self._refcount[bufid] -= 1
+        if self._refcount[bufid] == 0 and bufid in self._orphans:
+            self._orphans.discard(bufid)
+            del self._refcount[bufid]
+            return True
+        return False
+
+    def purge(self, evict=True):
+        """Removes collected and, if evict is True, least recently used
+        entries exceeding the cache size.
+
+        Returns the buffer ids, which are not in use anymore and can be
+        deleted.
+        """
+        freed = []
+        entries = self._entries
+        while self._collected:
+            bufid = entries.pop(self._collected.pop(), None)
+            if bufid is not None:
+                freed.extend(self._drop(bufid))
+        if evict and len(entries) > self.maxsize:
+            for key, bufid in list(entries.items()):
+                if len(entries) <= self.maxsize:
+                    break
+                if self._refcount[bufid] == 0:
+                    del entries[key]
+                    freed.extend(self._drop(bufid))
+        return freed
+
+    def _drop(self, bufid):
+        if self._refcount[bufid] == 0:
+            del self._refcount[bufid]
+            return [bufid]
+        self._orphans.add(bufid)
+        return []
+
+
+SinkStats = namedtuple("SinkStats", ["sources_used", "sources_free",
+                                     "virtual_voices", "buffers",
+                                     "bytes_uploaded", "upload_rate",
+                                     "underruns", "updates",
+                                     "update_latencies"])
 
 
 class SoundSink(object):
@@ -425,9 +1202,23 @@ class SoundSink(object):
     """
     MAX_BUFFERS_PER_SOURCE = 10
     MAX_BUFFER_SIZE = 48000
-
-    def __init__(self, device=None, attributes=None):
-        """Creates a new SoundSink for a specific audio output device."""
+    MAX_CACHED_BUFFERS = 256
+    SOURCE_BLOCK_SIZE = 16
+    BUFFER_BLOCK_SIZE = 16
+    MAX_POOLED_BUFFERS = 64
+    STREAM_BUFFERS = 3
+    MAX_VOICES = None
+    CULL_DISTANCE = None
+    LATENCY_BOUNDS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+
+    def __init__(self, device=None, attributes=None, error_mode="strict"):
+        """Creates a new SoundSink for a specific audio output device.
+
+        error_mode can be "strict" to check for OpenAL errors after each
+        operation, "deferred" to check them once per batch of operations on
+        update() or "off" to not check them at all.
+        """
+        self.error_mode = error_mode
         if isinstance(device, alc.ALCdevice):
             self.device = device
             self._deviceopened = False
@@ -447,17 +1238,96 @@ class SoundSink(object):
         self._sources = {}
         self._sids = {}
         self._streams = {}
+        # SoundSource -> deque of (buffer id, SoundData), in queue order
+        self._queued = {}
+        # SoundSource -> [(loop, future), ...]
+        self._stopwaiters = {}
+        # (SoundSource, SoundData) -> [(loop, future), ...]
+        self._datawaiters = {}
         self._listener = None
+        # SoundSource -> _VirtualVoice of sources without an OpenAL source
+        self._virtual = {}
+        self._voicelimit = None
+        self._lastupdate = None
+        # SoundSource objects, whose properties or buffer queues changed
+        # since the last update, reported by the sources themselves.
+        self._dirty = set()
+        # Changed SoundSource objects, which were culled on the last update
+        self._pending = set()
+        self._grid = None
+        # SoundSource objects, which are never culled
+        self._unculled = set()
+        self._arrays = []
+        # SoundSource -> (SourceArray, index)
+        self._arrayrows = {}
+        self._bufcache = _BufferCache(self.MAX_CACHED_BUFFERS)
+        self._sourcepool = _NamePool(self._generate_sources,
+                                     self.SOURCE_BLOCK_SIZE)
+        self._bufferpool = _NamePool(self._generate_buffers,
+                                     self.BUFFER_BLOCK_SIZE,
+                                     self._delete_buffers,
+                                     self.MAX_POOLED_BUFFERS)
+        # Functions to start and commit a batch of changes
+        self._batch = None
+        # Scratch values for OpenAL queries and buffer ids, which are reused
+        # instead of allocating new ctypes objects on each update.
+        self._intvalue = al.ALint()
+        self._intref = ctypes.byref(self._intvalue)
+        self._floatvalue = al.ALfloat()
+        self._floatref = ctypes.byref(self._floatvalue)
+        self._bufid = al.ALuint()
+        self._bufidref = ctypes.byref(self._bufid)
+        self._bufids = (al.ALuint * self.MAX_BUFFERS_PER_SOURCE)()
+        # Runtime statistics, see stats()
+        self._uploaded = 0
+        self._underruns = 0
+        # SoundSource -> processed buffers since attaching it
+        self._processed = {}
+        # Upper bound of the update() duration -> number of updates
+        self._latencies = {}
+        self._statstime = _clock()
+        self._statsuploaded = 0
+        self._thread = None
+        self._threadstop = threading.Event()
+        self._threaderror = None
+        self._commands = deque()
 
     def __del__(self):
         context = getattr(self, "context", None)
         if context:
             alc.alcDestroyContext(context)
         self.context = None
-        if self._deviceopened:
+        if getattr(self, "_deviceopened", False):
             alc.alcCloseDevice(self.device)
         self.device = None
 
+    @property
+    def error_mode(self):
+        """Gets or sets, how OpenAL errors are checked."""
+        return self._errormode
+
+    @error_mode.setter
+    def error_mode(self, mode):
+        """Gets or sets, how OpenAL errors are checked."""
+        if mode not in _ERRORMODES:
+            raise ValueError("invalid error mode %r" % (mode,))
+        self._errormode = mode
+        if mode == "strict":
+            self._check = _continue_or_raise
+        else:
+            self._check = _ignore_errors
+
+    def _check_batch(self, batch):
+        """Raises an OpenALError, if an operation of the batch failed in the
+        deferred error mode."""
+        if self._errormode != "deferred":
+            return
+        err = al.alGetError()
+        if err != al.AL_NO_ERROR:
+            error = OpenALError("%s in %s" % (_get_error_message(err), batch))
+            error.errcode = err
+            raise error
+
     def activate(self):
         """Marks the SoundSink as being the current one for operating on
         the OpenAL states."""
@@ -481,147 +1351,1057 @@ class SoundSink(object):
         """Gets, whether the SoundSink initially opened the device."""
         return self._deviceopened
 
+    @_handover
     def refresh(self, source):
         """Refreshes the passed SoundSource's internal state."""
         sid = self._sources.get(source, None)
         if sid is None:
+            if source in self._virtual:
+                # Nothing to fetch from OpenAL
+                return
             raise ValueError("source not associated with the SoundSink")
         for key in _SOURCECALLBACKS:
             source.dataproperties[key] = _to_python(_get_source_value(sid, key))
 
+    def snapshot(self, sources=None, out=None):
+        """Gets the AL_SOURCE_STATE, AL_SEC_OFFSET, AL_BUFFERS_QUEUED and
+        AL_BUFFERS_PROCESSED values of the passed or all attached sources as
+        SourceSnapshot.
+
+        If a SourceSnapshot is passed as out, its arrays are reused.
+        """
+        if sources is None:
+            sources = list(self._sources)
+            sources.extend(self._virtual)
+        else:
+            sources = list(sources)
+        if out is None:
+            out = SourceSnapshot(len(sources))
+        else:
+            out._reserve(len(sources))
+        out.sources = sources
+        arrays = out._arrays
+        states = arrays["source_state"]
+        offsets = arrays["sec_offset"]
+        queued = arrays["buffers_queued"]
+        processed = arrays["buffers_processed"]
+        # The getters expect element pointers, so pass references to the
+        # first elements sharing the arrays' memory along with offsets.
+        firststate = al.ALint.from_buffer(states)
+        firstoffset = al.ALfloat.from_buffer(offsets)
+        firstqueued = al.ALint.from_buffer(queued)
+        firstprocessed = al.ALint.from_buffer(processed)
+        intsize = ctypes.sizeof(al.ALint)
+        floatsize = ctypes.sizeof(al.ALfloat)
+        byref = ctypes.byref
+        getsourcei = al.alGetSourcei
+        getsourcef = al.alGetSourcef
+        sids = self._sources
+        virtual = self._virtual
+        for index, source in enumerate(sources):
+            sid = sids.get(source, None)
+            if sid is not None:
+                offset = index * intsize
+                getsourcei(sid, al.AL_SOURCE_STATE, byref(firststate, offset))
+                getsourcef(sid, al.AL_SEC_OFFSET,
+                           byref(firstoffset, index * floatsize))
+                getsourcei(sid, al.AL_BUFFERS_QUEUED,
+                           byref(firstqueued, offset))
+                getsourcei(sid, al.AL_BUFFERS_PROCESSED,
+                           byref(firstprocessed, offset))
+                continue
+            voice = virtual.get(source, None)
+            if voice is not None:
+                states[index] = voice.state
+                offsets[index] = voice.offset
+                queued[index] = len(voice.entries)
+            else:
+                states[index] = al.AL_INITIAL
+                offsets[index] = 0
+                queued[index] = 0
+            processed[index] = 0
+        self._check()
+        return out
+
+    @property
+    def updating(self):
+        """Indicates, if the update thread of the SoundSink is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_update_thread(self, rate=60):
+        """Starts a background thread, which calls update() rate times per
+        second.
+
+        While the thread is running, calls to play(), stop(), pause(),
+        rewind(), detach(), refresh() and update() from other threads are
+        handed over to the update thread and executed on its next update.
+        Property changes of sources and the listener are picked up on the
+        next update.
+
+        Exceptions of handed over calls do not stop the thread, the first
+        one is raised by stop_update_thread(). If the thread stops due to an
+        exception of update(), the exception is raised by the next call,
+        which would be handed over, and the SoundSink continues without
+        the thread.
+        """
+        if self._thread is not None:
+            raise RuntimeError("update thread is already running")
+        self._threadstop.clear()
+        self._threaderror = None
+        self._thread = threading.Thread(target=self._run_updates,
+                                        args=(1.0 / rate,),
+                                        name="SoundSink-update")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop_update_thread(self):
+        """Stops the background update thread.
+
+        Pending calls handed over to the thread are executed and a final
+        update is done, before it stops. If the thread stopped due to an
+        exception or a handed over call raised an exception, the exception
+        is raised.
+        """
+        if self._thread is None:
+            return
+        self._threadstop.set()
+        self._join_update_thread()
+
+    def _join_update_thread(self):
+        """Waits for the update thread to finish and raises the exception,
+        which stopped it or was raised first by a handed over call.
+
+        Calls, which were not executed by the thread, are discarded.
+        """
+        self._thread.join()
+        self._thread = None
+        self._commands.clear()
+        error, self._threaderror = self._threaderror, None
+        if error is not None:
+            raise error
+
+    def _run_commands(self):
+        """Executes the calls handed over to the update thread.
+
+        Exceptions are kept for stop_update_thread(), so that the thread
+        continues with the next call.
+        """
+        commands = self._commands
+        while commands:
+            func, args = commands.popleft()
+            try:
+                func(self, *args)
+            except Exception as exc:
+                if self._threaderror is None:
+                    self._threaderror = exc
+
+    def _run_updates(self, interval):
+        """The update loop of the background update thread."""
+        stop = self._threadstop
+        try:
+            self.activate()
+            while not stop.is_set():
+                start = _clock()
+                self._run_commands()
+                self.update()
+                stop.wait(max(0, interval - (_clock() - start)))
+            self._run_commands()
+            self.update()
+        except Exception as exc:
+            self._threaderror = exc
+
+    def _get_context_attributes(self):
+        """Gets the attributes of the SoundSink's context as dict."""
+        size = alc.ALCint()
+        alc.alcGetIntegerv(self.device, alc.ALC_ATTRIBUTES_SIZE, 1,
+                           ctypes.byref(size))
+        attrs = (alc.ALCint * max(size.value, 1))()
+        alc.alcGetIntegerv(self.device, alc.ALC_ALL_ATTRIBUTES, size.value,
+                           attrs)
+        _continue_or_raise(self.device)
+        result = {}
+        # The attributes are a 0-terminated list of key-value pairs.
+        for index in range(0, len(attrs) - 1, 2):
+            if attrs[index] == 0:
+                break
+            result[attrs[index]] = attrs[index + 1]
+        return result
+
+    def _clear_error(self):
+        """Clears the error flag outside of the strict error mode, so that
+        an error of an unchecked operation is not taken for an error of the
+        next one."""
+        if self._errormode != "strict":
+            al.alGetError()
+
+    def _generate_sources(self, count):
+        """Creates count new OpenAL source ids."""
+        sids = (al.ALuint * count)()
+        self._clear_error()
+        al.alGenSources(count, sids)
+        _continue_or_raise()
+        return list(sids)
+
+    def _generate_buffers(self, count):
+        """Creates count new OpenAL buffer ids."""
+        bufids = (al.ALuint * count)()
+        self._clear_error()
+        al.alGenBuffers(count, bufids)
+        _continue_or_raise()
+        return list(bufids)
+
+    def _release_buffers(self, bufids):
+        """Puts the passed OpenAL buffer ids back into the buffer pool."""
+        release = self._bufferpool.release
+        for bufid in bufids:
+            release(bufid)
+
     def _create_source_id(self, source):
-        """Creates a OpenAL source id for the passed SoundSource."""
-        if source in self._sources:
+        """Creates a OpenAL source id for the passed SoundSource.
+
+        If all voices are in use, the SoundSource is virtualized and None
+        is returned.
+        """
+        sid = self._sources.get(source, None)
+        if sid is not None:
             # We should have a OpenAL source id already
-            return self._sources[source]
-        # None yet, create a new one or bind it to an existing id
+            return sid
+        pool = self._sourcepool
+        if pool.size == 0:
+            # Preallocate all sources, the context is configured for, at
+            # once.
+            attrs = self._get_context_attributes()
+            count = attrs.get(alc.ALC_MONO_SOURCES, 0) + \
+                attrs.get(alc.ALC_STEREO_SOURCES, 0)
+            self._voicelimit = self.MAX_VOICES or count or None
+            if self._voicelimit:
+                try:
+                    pool.reserve(self._voicelimit)
+                except OpenALError:
+                    # Might be less available than announced, fall back
+                    # to blocks.
+                    self._voicelimit = self.MAX_VOICES
+        limit = self._voicelimit
         sid = None
-        for p, v in self._sids.items():
-            if v is None:
-                # Unused sid, use that one
-                sid = p
-        if not sid:
-            sid = al.ALuint()
-            al.alGenSources(1, sid)
-            _continue_or_raise()
-        self._sources[source] = sid.value
-        self._sids[sid.value] = source
-        return sid.value
+        if len(pool) > 0 or limit is None or pool.size < limit:
+            try:
+                if len(pool) == 0 and limit is not None:
+                    pool.reserve(min(pool.blocksize, limit - pool.size))
+                sid = pool.acquire()
+            except OpenALError:
+                # The device ran out of sources.
+                self._voicelimit = pool.size
+        if sid is None:
+            if source not in self._virtual:
+                self._virtual[source] = _VirtualVoice()
+                self._track(source)
+            return None
+        if source not in self._virtual:
+            self._track(source)
+        self._sources[source] = sid
+        self._sids[sid] = source
+        row = self._arrayrows.get(source, None)
+        if row is not None:
+            row[0]._stale.add(row[1])
+        return sid
+
+    def _track(self, source):
+        """Lets the SoundSink keep track of the changes of a newly attached
+        SoundSource."""
+        source._observer = self._dirty
+        # Apply its initial properties and buffer queue on the next update.
+        self._dirty.add(source)
+        if self._grid is not None:
+            self._place(source)
+
+    def _untrack(self, source):
+        """Stops keeping track of the changes of the SoundSource."""
+        if source._observer is self._dirty:
+            source._observer = None
+        self._dirty.discard(source)
+        self._pending.discard(source)
+        self._unculled.discard(source)
+        self._processed.pop(source, None)
+        if self._grid is not None:
+            self._grid.remove(source)
+
+    def _place(self, source):
+        """Puts the SoundSource into the spatial grid or, if it can not be
+        culled, into the unculled sources."""
+        props = source.dataproperties
+        position = props.get(al.AL_POSITION, None)
+        if position is not None and source not in self._arrayrows and \
+                not props.get(al.AL_SOURCE_RELATIVE, False):
+            try:
+                self._grid.move(source, position)
+                self._unculled.discard(source)
+                return
+            except (TypeError, ValueError):
+                pass
+        self._grid.remove(source)
+        self._unculled.add(source)
+
+    def _get_audible_sources(self, changed):
+        """Gets the attached SoundSource objects, which are within the
+        CULL_DISTANCE or the max_distance of a source around the
+        listener, as set.
+
+        The positions of the changed sources are updated first.
+        """
+        distance = self.CULL_DISTANCE
+        if self._grid is None or self._grid.cellsize != distance:
+            self._grid = _SpatialGrid(distance)
+            self._unculled.clear()
+            changed = list(self._sources) + list(self._virtual)
+        for source in changed:
+            if source in self._sources or source in self._virtual:
+                self._place(source)
+        listenerpos = self.listener.dataproperties.get(al.AL_POSITION, None)
+        audible = set(self._grid.query(listenerpos or (0, 0, 0), distance,
+                                       _get_max_distance))
+        audible.update(self._unculled)
+        # Streams need to be refilled to not run dry.
+        audible.update(self._streams)
+        return audible
+
+    def _process_culled(self, culled, changed):
+        """Processes the SoundSource objects, which are out of range.
+
+        Sources bound to OpenAL sources may still be audible, so that their
+        changed properties are applied right away. Virtualized sources keep
+        playing without OpenAL. Queued sounds and the changes of the other
+        sources are kept, until they get into range.
+        """
+        pending = set()
+        sources = self._sources
+        virtual = self._virtual
+        for source in culled:
+            sid = sources.get(source, None)
+            if sid is not None:
+                self._apply_properties(source, sid)
+                if source.bufferqueue:
+                    pending.add(source)
+                continue
+            if source in virtual:
+                self._process_virtual(source)
+            if source in changed:
+                pending.add(source)
+        self._pending = pending
+
+    def _add_source_array(self, sources):
+        """Adds the SourceArray to the arrays processed on updates."""
+        self._arrays.append(sources)
+        for index, source in enumerate(sources.sources):
+            self._arrayrows[source] = (sources, index)
+            if source in self._sources:
+                sources._stale.add(index)
+
+    def _get_sourcei(self, sid, prop):
+        """Gets an integer OpenAL source property value via the scratch
+        value of the SoundSink."""
+        al.alGetSourcei(sid, prop, self._intref)
+        return self._intvalue.value
+
+    def _unqueue_buffers(self, source, sid):
+        """Unqueues the processed buffers of the SoundSource.
+
+        Buffers of cached SoundData objects are released to the cache,
+        all others are returned to the buffer pool.
+        """
+        bufcount = self._get_sourcei(sid, al.AL_BUFFERS_PROCESSED)
+        if bufcount == 0:
+            return
+        if bufcount > len(self._bufids):
+            self._bufids = (al.ALuint * bufcount)()
+        al.alSourceUnqueueBuffers(sid, bufcount, self._bufids)
+        self._check()
+        bufids = self._bufids[:bufcount]
+        self._processed[source] = self._processed.get(source, 0) + bufcount
+        cache = self._bufcache
+        release = self._bufferpool.release
+        queued = self._queued.get(source, None)
+        for bufid in bufids:
+            if bufid in cache:
+                # Cached SoundData buffers are kept for the next queue
+                # call.
+                if cache.release(bufid):
+                    release(bufid)
+            else:
+                release(bufid)
+            if queued:
+                data = queued.popleft()[1]
+                if self._datawaiters and \
+                        (len(queued) == 0 or queued[0][1] is not data) and \
+                        self._streams.get(source, None) is not data:
+                    # The last buffer of the SoundData was processed.
+                    self._notify_waiters(self._datawaiters, (source, data))
+        if queued is not None and len(queued) == 0:
+            # Nothing left to poll for.
+            del self._queued[source]
+
+    def _notify_waiters(self, waiters, key):
+        """Resolves the asyncio futures waiting for the key."""
+        for loop, future in waiters.pop(key, ()):
+            _resolve_future(loop, future)
+
+    def _add_waiter(self, waiters, key, loop):
+        """Creates an asyncio future waiting for the key."""
+        if loop is None:
+            loop = _get_running_loop()
+        future = loop.create_future()
+        waiters.setdefault(key, []).append((loop, future))
+        return future
+
+    def wait_stopped(self, source, loop=None):
+        """Gets an asyncio future, which is resolved on the next update,
+        that finds the SoundSource in the AL_STOPPED state.
+
+        If no loop is passed, it must be called from the running asyncio
+        event loop.
+        """
+        return self._add_waiter(self._stopwaiters, source, loop)
 
-    def play(self, sources):
-        """Starts playing the buffered sounds of the source or sources."""
-        if isinstance(sources, Iterable):
-            sids = []
-            for source in sources:
-                sid = self._create_source_id(source)
-                sids.append(sid)
-            al.alSourcePlayv(_to_ctypes(sids, al.ALuint), len(sids))
-        else:
-            sid = self._create_source_id(sources)
+    def wait_processed(self, source, sounddata, loop=None):
+        """Gets an asyncio future, which is resolved, once the SoundSource
+        finished processing the queued SoundData.
+
+        If no loop is passed, it must be called from the running asyncio
+        event loop.
+        """
+        return self._add_waiter(self._datawaiters, (source, sounddata), loop)
+
+    def update_async(self, interval=1 / 60.0, loop=None):
+        """Calls update() every interval seconds on the asyncio event loop.
+
+        Returns an asyncio future, which stops the updates, if it is
+        cancelled. If update() raises an exception, the updates stop and
+        the exception is set on the future.
+
+        If no loop is passed, it must be called from the running asyncio
+        event loop.
+        """
+        if loop is None:
+            loop = _get_running_loop()
+        driver = loop.create_future()
+
+        def _tick():
+            if driver.done():
+                return
+            start = loop.time()
+            try:
+                self.update()
+            except Exception as exc:
+                driver.set_exception(exc)
+                return
+            loop.call_later(max(0, interval - (loop.time() - start)), _tick)
+        loop.call_soon(_tick)
+        return driver
+
+    @_handover
+    def detach(self, source):
+        """Detaches the SoundSource from the SoundSink.
+
+        This stops the playback of the SoundSource and puts its OpenAL
+        source back into the SoundSink's source pool. The SoundSource will
+        be attached again, if it is played or processed later on.
+
+        If a SourceArray is passed, all its sources are detached and the
+        SoundSink stops processing it.
+        """
+        if isinstance(source, SourceArray):
+            if source not in self._arrays:
+                raise ValueError("source not associated with the SoundSink")
+            self._arrays.remove(source)
+            for arraysource in source.sources:
+                del self._arrayrows[arraysource]
+                if arraysource in self._sources or \
+                        arraysource in self._virtual:
+                    self._detach(arraysource)
+            return
+        self._detach(source)
+
+    def _detach(self, source):
+        """Detaches the SoundSource from the SoundSink."""
+        voice = self._virtual.pop(source, None)
+        if voice is not None:
+            self._untrack(source)
+            self._stop_virtual(source, voice)
+            self._notify_waiters(self._stopwaiters, source)
+            return
+        if source not in self._sources:
+            raise ValueError("source not associated with the SoundSink")
+        self._untrack(source)
+        self._streams.pop(source, None)
+        self._release_source(source)
+        self._notify_waiters(self._stopwaiters, source)
+
+    def _release_source(self, source):
+        """Stops the OpenAL source of the SoundSource and puts it back into
+        the source pool."""
+        sid = self._sources.pop(source)
+        del self._sids[sid]
+        al.alSourceStop(sid)
+        self._unqueue_buffers(source, sid)
+        self._queued.pop(source, None)
+        # Reset everything, the SoundSource changed, so that the next
+        # SoundSource using the sid starts with a clean state and this one
+        # gets its properties applied again on reattaching.
+        changed = set()
+        for prop in source.dataproperties:
+            if prop in _SOURCEDEFAULTS:
+                _set_source_value(sid, prop, _SOURCEDEFAULTS[prop])
+                changed.add(prop)
+        if source in self._arrayrows:
+            for prop, width in SourceArray._PROPERTIES:
+                _set_source_value(sid, prop, _SOURCEDEFAULTS[prop])
+        self._check()
+        source.changedproperties = changed
+        self._sourcepool.release(sid)
+
+    def _virtualize(self, source):
+        """Releases the OpenAL source of the SoundSource, keeping its
+        playback state, so that it can be restored later on."""
+        sid = self._sources[source]
+        self._unqueue_buffers(source, sid)
+        state = self._get_sourcei(sid, al.AL_SOURCE_STATE)
+        al.alGetSourcef(sid, al.AL_SEC_OFFSET, self._floatref)
+        offset = self._floatvalue.value
+        self._check()
+        # Pop the queued sounds first, so that releasing the source does
+        # not consider them to be processed.
+        entries = [entry[1] for entry in self._queued.pop(source, ())]
+        self._release_source(source)
+        self._virtual[source] = _VirtualVoice(entries, offset, state)
+
+    def _restore(self, source):
+        """Binds the virtualized SoundSource to an OpenAL source again and
+        continues its playback.
+
+        Returns False, if no OpenAL source is available.
+        """
+        sid = self._create_source_id(source)
+        if sid is None:
+            return False
+        voice = self._virtual.pop(source)
+        self._apply_properties(source, sid)
+        queued = deque()
+        for data in voice.entries:
+            bufid = self._get_buffer(data)
+            self._bufcache.acquire(bufid)
+            self._bufid.value = bufid
+            al.alSourceQueueBuffers(sid, 1, self._bufidref)
+            queued.append((bufid, data))
+        self._check()
+        if queued:
+            self._queued[source] = queued
+        if voice.offset > 0:
+            al.alSourcef(sid, al.AL_SEC_OFFSET, voice.offset)
+        if voice.state in (al.AL_PLAYING, al.AL_PAUSED):
             al.alSourcePlay(sid)
-        _continue_or_raise()
+            if voice.state == al.AL_PAUSED:
+                al.alSourcePause(sid)
+        self._check()
+        return True
+
+    def _stop_virtual(self, source, voice):
+        """Stops the virtual voice of the SoundSource, marking all its
+        queued sounds as processed."""
+        entries = voice.entries
+        while entries:
+            data = entries.popleft()
+            if not entries or entries[0] is not data:
+                self._notify_waiters(self._datawaiters, (source, data))
+        voice.offset = 0.0
+        voice.state = al.AL_STOPPED
+
+    def _advance_virtual(self, elapsed, sources):
+        """Advances the playback positions of the virtual voices of the
+        passed sources by the elapsed time in seconds."""
+        for source in sources:
+            voice = self._virtual[source]
+            if voice.state != al.AL_PLAYING:
+                continue
+            props = source.dataproperties
+            voice.offset += elapsed * (props.get(al.AL_PITCH, None) or 1.0)
+            entries = voice.entries
+            if props.get(al.AL_LOOPING, False):
+                total = sum(_get_duration(data) for data in entries)
+                if total > 0:
+                    voice.offset %= total
+                continue
+            while entries:
+                duration = _get_duration(entries[0])
+                if voice.offset < duration:
+                    break
+                voice.offset -= duration
+                data = entries.popleft()
+                if not entries or entries[0] is not data:
+                    self._notify_waiters(self._datawaiters, (source, data))
+            if not entries:
+                voice.offset = 0.0
+                voice.state = al.AL_STOPPED
+
+    def _rebalance_voices(self, sources):
+        """Binds the most important virtual voices of the passed sources to
+        OpenAL sources, stealing the sources of less important ones, if
+        necessary.
+
+        The importance is determined by the priority of a SoundSource and
+        its estimated gain at the listener position.
+        """
+        virtual = self._virtual
+        waiting = [source for source in sources
+                   if (virtual[source].entries and
+                       virtual[source].state == al.AL_PLAYING) or
+                   len(source.bufferqueue) > 0]
+        if not waiting:
+            return
+        listenerpos = self.listener.dataproperties.get(al.AL_POSITION, None)
+        listenerpos = listenerpos or (0, 0, 0)
+
+        def _score(source):
+            return (source.priority,
+                    _estimate_audibility(source, listenerpos))
+        waiting.sort(key=_score, reverse=True)
+        candidates = None
+        for source in waiting:
+            if self._restore(source):
+                continue
+            if candidates is None:
+                # Streams are never stolen, including exhausted ones, which
+                # still play their last chunks. Sources without any queued
+                # sounds are stolen first.
+                candidates = []
+                for bound in self._sources:
+                    if bound in self._streams or \
+                            self._has_queued_stream(bound):
+                        continue
+                    if not self._queued.get(bound, None) and \
+                            len(bound.bufferqueue) == 0:
+                        score = (float("-inf"), 0)
+                    else:
+                        score = _score(bound)
+                    candidates.append((score, bound))
+                candidates.sort(key=lambda candidate: candidate[0],
+                                reverse=True)
+            if not candidates or candidates[-1][0] >= _score(source):
+                break
+            self._virtualize(candidates.pop()[1])
+            self._restore(source)
 
+    def _has_queued_stream(self, source):
+        """Checks, if chunks of a StreamingSoundData are queued on the OpenAL
+        source of the SoundSource."""
+        for bufid, data in self._queued.get(source, ()):
+            if getattr(data, "streaming", False):
+                return True
+        return False
+
+    def _process_virtual(self, source):
+        """Processes the passed virtualized SoundSource."""
+        voice = self._virtual[source]
+        bufferqueue = source.bufferqueue
+        # Streams wait for an OpenAL source in the buffer queue.
+        while bufferqueue and not getattr(bufferqueue[0], "streaming", False):
+            voice.entries.append(bufferqueue.pop(0))
+            if voice.state != al.AL_PAUSED:
+                voice.state = al.AL_PLAYING
+        if voice.state == al.AL_STOPPED and source in self._stopwaiters:
+            self._notify_waiters(self._stopwaiters, source)
+
+    def _get_virtual(self, sources):
+        """Gets the (SoundSource, _VirtualVoice) pairs of the passed
+        sources, which are virtualized."""
+        virtual = self._virtual
+        return [(source, virtual[source]) for source in sources
+                if source in virtual]
+
+    @_handover
+    def play(self, sources):
+        """Starts playing the buffered sounds of the source or sources.
+
+        If a SourceArray is passed, the SoundSink processes its arrays on
+        every update, until it is detached.
+        """
+        if isinstance(sources, SourceArray) and sources not in self._arrays:
+            self._add_source_array(sources)
+        if not isinstance(sources, Iterable):
+            sources = (sources,)
+        sids = []
+        dirty = self._dirty
+        for source in sources:
+            # Pick up sounds, which were added to the buffer queue directly.
+            dirty.add(source)
+            sid = self._create_source_id(source)
+            if sid is not None:
+                sids.append(sid)
+                continue
+            voice = self._virtual[source]
+            if voice.state not in (al.AL_INITIAL, al.AL_PAUSED):
+                voice.offset = 0.0
+            voice.state = al.AL_PLAYING
+        if len(sids) == 1:
+            al.alSourcePlay(sids[0])
+        elif sids:
+            al.alSourcePlayv(len(sids), _to_ctypes(sids, al.ALuint))
+        self._check()
+
+    @_handover
     def stop(self, sources):
-        """Stops playing the buffered sounds of the source or sources."""
-        if isinstance(sources, Iterable):
-            sids = [self._sources[source] for source in sources
-                    if source in self._sources]
-            al.alSourceStopv(_to_ctypes(sids, al.ALuint), len(sids))
-        elif sources in self._sources:
-            al.alSourceStop(self._sources[source])
-        _continue_or_raise()
+        """Stops playing the buffered sounds of the source or sources.
 
+        Streams being played by the sources are stopped as well.
+        """
+        if isinstance(sources, Iterable):
+            sources = list(sources)
+            bound = [source for source in sources if source in self._sources]
+            sids = [self._sources[source] for source in bound]
+            al.alSourceStopv(len(sids), _to_ctypes(sids, al.ALuint))
+        else:
+            sources = [sources]
+            bound = [source for source in sources if source in self._sources]
+            if bound:
+                al.alSourceStop(self._sources[bound[0]])
+        for source in bound:
+            self._stop_stream(source, self._sources[source])
+        for source, voice in self._get_virtual(sources):
+            self._stop_virtual(source, voice)
+        self._check()
+
+    @_handover
     def pause(self, sources):
         """Pauses the playback of the buffered sounds of the source or
         sources."""
         if isinstance(sources, Iterable):
+            sources = list(sources)
             sids = [self._sources[source] for source in sources
                     if source in self._sources]
-            al.alSourcePausev(_to_ctypes(sids, al.ALuint), len(sids))
-        elif sources in self._sources:
-            al.alSourcePause(self._sources[source])
-        _continue_or_raise()
-
+            al.alSourcePausev(len(sids), _to_ctypes(sids, al.ALuint))
+        else:
+            sources = [sources]
+            if sources[0] in self._sources:
+                al.alSourcePause(self._sources[sources[0]])
+        for source, voice in self._get_virtual(sources):
+            if voice.state == al.AL_PLAYING:
+                voice.state = al.AL_PAUSED
+        self._check()
+
+    @_handover
     def rewind(self, sources):
         """Rewinds the buffers of the source or sources."""
         if isinstance(sources, Iterable):
+            sources = list(sources)
             sids = [self._sources[source] for source in sources
                     if source in self._sources]
-            al.alSourceRewindv(_to_ctypes(sids, al.ALuint), len(sids))
-        elif sources in self._sources:
-            al.alSourceRewind(self._sources[source])
-        _continue_or_raise()
+            al.alSourceRewindv(len(sids), _to_ctypes(sids, al.ALuint))
+        else:
+            sources = [sources]
+            if sources[0] in self._sources:
+                al.alSourceRewind(self._sources[sources[0]])
+        for source, voice in self._get_virtual(sources):
+            voice.offset = 0.0
+            voice.state = al.AL_INITIAL
+        self._check()
+
+    def _get_buffer(self, sounddata):
+        """Gets the OpenAL buffer id for the passed SoundData, uploading the
+        audio data on its first use."""
+        bufid = self._bufcache.get(sounddata)
+        if bufid is not None:
+            return bufid
+        bufid = self._bufferpool.acquire()
+        try:
+            self._uploaded += _buffer_data(bufid, sounddata.format,
+                                           sounddata.data, sounddata.size,
+                                           sounddata.frequency)
+            self._check()
+        except Exception:
+            self._bufferpool.release(bufid)
+            raise
+        self._bufcache.add(sounddata, bufid)
+        return bufid
+
+    def _delete_buffers(self, bufids):
+        """Deletes the passed OpenAL buffer ids."""
+        if len(bufids) > 0:
+            al.alDeleteBuffers(len(bufids), _to_ctypes(bufids, al.ALuint))
+            self._check()
+
+    def _read_stream(self, source, sid, stream):
+        """Reads the next chunk of the StreamingSoundData into a pooled
+        OpenAL buffer.
+
+        Returns the buffer id or None, if the stream is exhausted.
+        """
+        blocksize = 1
+        if stream.channels and stream.bitrate:
+            blocksize = stream.channels * stream.bitrate // 8
+        size = self.MAX_BUFFER_SIZE - self.MAX_BUFFER_SIZE % blocksize
+        chunk = stream.read(size)
+        if not chunk and source.dataproperties.get(al.AL_LOOPING, False):
+            # Loop the stream itself, since a looping OpenAL source would
+            # never mark its buffers as processed.
+            try:
+                stream.seek(0)
+            except IOError:
+                # Pipes, sockets and the like can not be rewound, so the
+                # stream is finished.
+                return None
+            chunk = stream.read(size)
+        if not chunk:
+            return None
+        # Pipes and sockets may deliver less than requested.
+        while len(chunk) < size:
+            more = stream.read(size - len(chunk))
+            if not more:
+                break
+            chunk += more
+        # OpenAL only accepts complete sample frames.
+        chunksize = len(chunk) - len(chunk) % blocksize
+        if chunksize == 0:
+            return None
+        bufid = self._bufferpool.acquire()
+        try:
+            self._uploaded += _buffer_data(bufid, stream.format, chunk,
+                                           chunksize, stream.frequency)
+            self._check()
+        except Exception:
+            self._bufferpool.release(bufid)
+            raise
+        return bufid
+
+    def _start_stream(self, source, sid, stream):
+        """Makes the StreamingSoundData the active stream of the
+        SoundSource."""
+        self._streams[source] = stream
+        _set_source_value(sid, al.AL_LOOPING, False)
+
+    def _stop_stream(self, source, sid):
+        """Removes the active stream of the SoundSource, if any."""
+        if self._streams.pop(source, None) is not None:
+            _set_source_value(sid, al.AL_LOOPING,
+                              source.dataproperties.get(al.AL_LOOPING, False))
+
+    def _apply_properties(self, source, sid):
+        """Passes the changed properties of the SoundSource to OpenAL."""
+        streams = self._streams
+        for prop in _pop_changes(source):
+            if prop == al.AL_LOOPING and source in streams:
+                # Looping streams are handled in _read_stream()
+                continue
+            _set_source_value(sid, prop, source.dataproperties[prop])
 
     def process_source(self, source):
         """Processes the passed SoundSource."""
         sid = self._create_source_id(source)
-        # Apply the changed information of the source, if any
-        props = getattr(source, "changedproperties", [])
-        for prop in props:
-            _set_source_value(sid, prop, source.dataproperties[prop])
-        source.changedproperties = []
-
-        # Check the OpenAL buffers for the sid
-        bufcount = al.ALint()
-        freebufs = []
-        al.alGetSourcei(sid, al.AL_BUFFERS_PROCESSED, ctypes.byref(bufcount))
-        bufcount = bufcount.value
-        while bufcount > 0:
-            bufid = al.ALuint()
-            al.alSourceUnqueueBuffers(sid, 1, ctypes.byref(bufid))
-            freebufs.append(bufid)
-            bufcount -= 1
-
-        queued = al.ALint()
-        al.alGetSourcei(sid, al.AL_BUFFERS_QUEUED, ctypes.byref(queued))
-        _continue_or_raise()
-        queued = queued.value
-
-        # Check the source's buffer queue
+        if sid is None:
+            self._process_virtual(source)
+            return
+        streams = self._streams
+        refilled = streams.get(source, None)
+        # Apply the changed information of the source, if any.
+        self._apply_properties(source, sid)
+
+        # Recycle the processed OpenAL buffers of the sid
+        self._unqueue_buffers(source, sid)
+
+        queued = self._get_sourcei(sid, al.AL_BUFFERS_QUEUED)
+        self._check()
+
+        # Refill the stream's ring buffer or queue the next sounds from the
+        # source's buffer queue.
+        added = 0
         while queued < self.MAX_BUFFERS_PER_SOURCE:
-            if len(source.bufferqueue) == 0:
+            stream = streams.get(source, None)
+            if stream is not None:
+                if queued >= self.STREAM_BUFFERS:
+                    break
+                data = stream
+                bufid = self._read_stream(source, sid, stream)
+                if bufid is None:
+                    # Exhausted, continue with the next queued sound.
+                    self._stop_stream(source, sid)
+                    if not any(entry[1] is stream for entry in
+                               self._queued.get(source, ())):
+                        self._notify_waiters(self._datawaiters,
+                                             (source, stream))
+                    continue
+            elif len(source.bufferqueue) == 0:
                 break
-            data = source.bufferqueue.pop(0)
-            if len(freebufs) > 0:
-                bufid = freebufs.pop()
             else:
-                bufid = al.ALuint()
-                al.alGenBuffers(1, ctypes.byref(bufid))
-                _continue_or_raise()
+                data = source.bufferqueue.pop(0)
+                if getattr(data, "streaming", False):
+                    # A stream that has to be read into a ring buffer
+                    self._start_stream(source, sid, data)
+                    continue
+                # A simple sound object - do not stream it, but upload it
+                # once and reuse the buffer for subsequent queue calls.
+                bufid = self._get_buffer(data)
+                self._bufcache.acquire(bufid)
+            self._bufid.value = bufid
+            al.alSourceQueueBuffers(sid, 1, self._bufidref)
+            self._check()
+            if source not in self._queued:
+                self._queued[source] = deque()
+            self._queued[source].append((bufid, data))
+            queued += 1
+            added += 1
 
-            if getattr(data, "streaming", False):
-                # A stream that has to be read into a ring buffer
-                sids = self._streams.get(data, {})
-                offset, size = sids.get(sid)
-                bufsize = min(self.MAX_BUFFER_SIZE, size - offset)
-                bufdata = data.read(bufsize)
-                source.bufferqueue.insert(data)
-            else:
-                # A simple sound object - do not stream it.
-                bufdata = data.data
-                bufsize = data.size
-            # Queue the complete data.
-            state = al.ALint()
-            al.alGetSourcei(sid, al.AL_SOURCE_STATE, ctypes.byref(state))
+        state = None
+        if added > 0:
+            # Start the playback for new sounds and restart it, if the
+            # stream ran out of buffers before being refilled.
+            state = self._get_sourcei(sid, al.AL_SOURCE_STATE)
             if state not in (al.AL_PAUSED, al.AL_PLAYING):
-                al.alBufferData(bufid, data.format, bufdata, bufsize,
-                                data.frequency)
-                _continue_or_raise()
-                al.alSourceQueueBuffers(sid, 1, bufid)
-                _continue_or_raise()
+                if state == al.AL_STOPPED and refilled is not None and \
+                        streams.get(source, None) is refilled:
+                    # The stream played all its buffers before it could be
+                    # refilled.
+                    self._underruns += 1
                 al.alSourcePlay(sid)
-            queued += 1
+                state = al.AL_PLAYING
+            self._check()
+
+        if source in self._stopwaiters:
+            if state is None:
+                state = self._get_sourcei(sid, al.AL_SOURCE_STATE)
+            if state == al.AL_STOPPED:
+                self._notify_waiters(self._stopwaiters, source)
+
+    def process_source_array(self, sources):
+        """Passes the changed values of the SourceArray to OpenAL."""
+        sids = self._sources
+        arraysources = sources.sources
+        for prop, width, values, rows in sources._changes():
+            for index in rows:
+                sid = sids.get(arraysources[index], None)
+                if sid is None:
+                    continue
+                if width == 3:
+                    offset = index * 3
+                    al.alSource3f(sid, prop, values[offset],
+                                  values[offset + 1], values[offset + 2])
+                else:
+                    al.alSourcef(sid, prop, values[index])
+        self._check()
 
     def process_listener(self):
         """Processes the SoundListener attached to the SoundSink."""
-        props = getattr(self.listener, "changedproperties", [])
-        for prop in props:
-            _set_listener_value(prop, self.listener.dataproperties[prop])
-        self.listener.changedproperties = []
+        listener = self.listener
+        for prop in _pop_changes(listener):
+            _set_listener_value(prop, listener.dataproperties[prop])
 
+    def _get_batch(self):
+        """Gets the functions to start and commit a batch of changes, so
+        that they are applied at once by the mixer.
+
+        The AL_SOFT_deferred_updates extension is used, if it is available,
+        alcSuspendContext() and alcProcessContext() otherwise.
+        """
+        if self._batch is None:
+            defer, process = ext.get_deferred_updates_functions()
+            if defer is None:
+                # Look the functions up on each call, since toggling the
+                # call statistics binds them again.
+                context = self.context
+                defer = lambda: alc.alcSuspendContext(context)
+                process = lambda: alc.alcProcessContext(context)
+            self._batch = (defer, process)
+        return self._batch
+
+    @_handover
     def update(self):
-        """Processes all currently attached sound sources."""
+        """Processes the attached sound sources, which changed since the
+        last update or are playing sounds.
+
+        All changes are committed at once at the end of the update.
+        """
+        defer, process = self._get_batch()
+        self._check_batch("the calls before update()")
+        start = _clock()
+        defer()
+        try:
+            self._update()
+        finally:
+            process()
+            self._add_latency(_clock() - start)
+
+    def _add_latency(self, duration):
+        """Counts the update() duration in the latency histogram."""
+        bounds = self.LATENCY_BOUNDS
+        index = bisect.bisect_left(bounds, duration)
+        bound = bounds[index] if index < len(bounds) else float("inf")
+        self._latencies[bound] = self._latencies.get(bound, 0) + 1
+
+    def stats(self):
+        """Gets the runtime statistics of the SoundSink as SinkStats.
+
+        The upload rate is measured since the previous stats() call.
+        """
+        now = _clock()
+        uploaded = self._uploaded
+        elapsed = now - self._statstime
+        rate = 0.0
+        if elapsed > 0:
+            rate = (uploaded - self._statsuploaded) / elapsed
+        self._statstime = now
+        self._statsuploaded = uploaded
+        processed = self._processed
+        buffers = dict((source, (len(queued), processed.get(source, 0)))
+                       for source, queued in list(self._queued.items()))
+        for source, count in list(processed.items()):
+            if source not in buffers and source in self._sources:
+                buffers[source] = (0, count)
+        latencies = sorted(self._latencies.items())
+        return SinkStats(len(self._sources), len(self._sourcepool),
+                         len(self._virtual), buffers, uploaded, rate,
+                         self._underruns, sum(n for _, n in latencies),
+                         tuple(latencies))
+
+    def _update(self):
+        """Processes the attached sound sources."""
+        self._release_buffers(self._bufcache.purge())
         self.process_listener()
+        self._check_batch("the listener update")
+        changed = self._pending
+        dirty = self._dirty
+        while dirty:
+            changed.add(dirty.pop())
+        # Sources with queued sounds need to be polled to recycle their
+        # buffers, refill streams and notify waiters.
+        active = set(self._queued)
+        active.update(self._streams)
+        active.update(self._stopwaiters)
+        virtual = self._virtual
+        active.update(source for source, voice in virtual.items()
+                      if voice.state == al.AL_PLAYING or source.bufferqueue)
+        if self.CULL_DISTANCE is None:
+            active.update(changed)
+            self._pending = set()
+        else:
+            audible = self._get_audible_sources(changed)
+            active.update(changed)
+            self._process_culled(active.difference(audible), changed)
+            active.intersection_update(audible)
+        now = _clock()
+        if virtual and self._lastupdate is not None:
+            # Culled virtual voices keep playing as well, so that they do
+            # not resume at a stale position, once they get into range.
+            self._advance_virtual(now - self._lastupdate, list(virtual))
+        waiting = [source for source in active if source in virtual]
+        if waiting:
+            self._rebalance_voices(waiting)
+        self._lastupdate = now
+        self._check_batch("the voice management")
+        for sources in self._arrays:
+            self.process_source_array(sources)
+        self._check_batch("the source array update")
         process_source = self.process_source
-        for source in self._sources:
-            process_source(source)
+        process_virtual = self._process_virtual
+        for source in active:
+            if source in self._sources:
+                process_source(source)
+            elif source in virtual:
+                process_virtual(source)
+        self._check_batch("the source update")
+        self._bufferpool.trim()
@@ -664,47 +664,42 @@ AL_MIN_METERS_PER_UNIT = 1e-37
 AL_MAX_METERS_PER_UNIT = 1e+37
 AL_DEFAULT_METERS_PER_UNIT = 1.0
 
-_bind = dll.bind_function
-
-alGenEffects = _bind("alGenEffects", [ALsizei, POINTER(ALuint)])
-alDeleteEffects = _bind("alDeleteEffects", [ALsizei, POINTER(ALuint)])
-alIsEffect = _bind("alIsEffect", [ALuint], ALboolean)
-alEffecti = _bind("alEffecti", [ALuint, ALenum, ALint])
-alEffectiv = _bind("alEffectiv", [ALuint, ALenum, POINTER(ALint)])
-alEffectf = _bind("alEffectf", [ALuint, ALenum, ALfloat])
-alEffectfv = _bind("alEffectfv", [ALuint, ALenum, POINTER(ALfloat)])
-alGetEffecti = _bind("alGetEffecti", [ALuint, ALenum, POINTER(ALint)])
-alGetEffectiv = _bind("alGetEffectiv", [ALuint, ALenum, POINTER(ALint)])
-alGetEffectf = _bind("alGetEffectf", [ALuint, ALenum, POINTER(ALfloat)])
-alGetEffectfv = _bind("alGetEffectfv", [ALuint, ALenum, POINTER(ALfloat)])
-alGenFilters = _bind("alGenFilters", [ALsizei, POINTER(ALuint)])
-alDeleteFilters = _bind("alDeleteFilters", [ALsizei, POINTER(ALuint)])
-alIsFilter = _bind("alIsFilter", [ALuint], ALboolean)
-alFilteri = _bind("alFilteri", [ALuint, ALenum, ALint])
-alFilteriv = _bind("alFilteriv", [ALuint, ALenum, POINTER(ALint)])
-alFilterf = _bind("alFilterf", [ALuint, ALenum, ALfloat])
-alFilterfv = _bind("alFilterfv", [ALuint, ALenum, POINTER(ALfloat)])
-alGetFilteri = _bind("alGetFilteri", [ALuint, ALenum, POINTER(ALint)])
-alGetFilteriv = _bind("alGetFilteriv", [ALuint, ALenum, POINTER(ALint)])
-alGetFilterf = _bind("alGetFilterf", [ALuint, ALenum, POINTER(ALfloat)])
-alGetFilterfv = _bind("alGetFilterfv", [ALuint, ALenum, POINTER(ALfloat)])
-alGenAuxiliaryEffectSlots = _bind("alGenAuxiliaryEffectSlots",
-                                  [ALsizei, POINTER(ALuint)])
-alDeleteAuxiliaryEffectSlots = _bind("alDeleteAuxiliaryEffectSlots",
-                                     [ALsizei, POINTER(ALuint)])
-alIsAuxiliaryEffectSlot = _bind("alIsAuxiliaryEffectSlot", [ALuint], ALboolean)
-alAuxiliaryEffectSloti = _bind("alAuxiliaryEffectSloti", [ALuint, ALenum, ALint])
-alAuxiliaryEffectSlotiv = _bind("alAuxiliaryEffectSlotiv",
-                                [ALuint, ALenum, POINTER(ALint)])
-alAuxiliaryEffectSlotf = _bind("alAuxiliaryEffectSlotf",
-                               [ALuint, ALenum, ALfloat])
-alAuxiliaryEffectSlotfv = _bind("alAuxiliaryEffectSlotfv",
-                                [ALuint, ALenum, POINTER(ALfloat)])
-alGetAuxiliaryEffectSloti = _bind("alGetAuxiliaryEffectSloti",
-                                  [ALuint, ALenum, POINTER(ALint)])
-alGetAuxiliaryEffectSlotiv = _bind("alGetAuxiliaryEffectSlotiv",
-                                   [ALuint, ALenum, POINTER(ALint)])
-alGetAuxiliaryEffectSlotf = _bind("alGetAuxiliaryEffectSlotf",
-                                  [ALuint, ALenum, POINTER(ALfloat)])
-alGetAuxiliaryEffectSlotfv = _bind("alGetAuxiliaryEffectSlotfv",
-                                   [ALuint, ALenum, POINTER(ALfloat)])
+
+# Function name -> (argument types, return type) of the lazily
+# bound functions, see _DLL.bind_functions().
+_FUNCTIONS = {
+    "alGenEffects": ([ALsizei, POINTER(ALuint)], None),
+    "alDeleteEffects": ([ALsizei, POINTER(ALuint)], None),
+    "alIsEffect": ([ALuint], ALboolean),
+    "alEffecti": ([ALuint, ALenum, ALint], None),
+    "alEffectiv": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alEffectf": ([ALuint, ALenum, ALfloat], None),
+    "alEffectfv": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGetEffecti": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alGetEffectiv": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alGetEffectf": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGetEffectfv": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGenFilters": ([ALsizei, POINTER(ALuint)], None),
+    "alDeleteFilters": ([ALsizei, POINTER(ALuint)], None),
+    "alIsFilter": ([ALuint], ALboolean),
+    "alFilteri": ([ALuint, ALenum, ALint], None),
+    "alFilteriv": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alFilterf": ([ALuint, ALenum, ALfloat], None),
+    "alFilterfv": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGetFilteri": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alGetFilteriv": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alGetFilterf": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGetFilterfv": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGenAuxiliaryEffectSlots": ([ALsizei, POINTER(ALuint)], None),
+    "alDeleteAuxiliaryEffectSlots": ([ALsizei, POINTER(ALuint)], None),
+    "alIsAuxiliaryEffectSlot": ([ALuint], ALboolean),
+    "alAuxiliaryEffectSloti": ([ALuint, ALenum, ALint], None),
+    "alAuxiliaryEffectSlotiv": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alAuxiliaryEffectSlotf": ([ALuint, ALenum, ALfloat], None),
+    "alAuxiliaryEffectSlotfv": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGetAuxiliaryEffectSloti": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alGetAuxiliaryEffectSlotiv": ([ALuint, ALenum, POINTER(ALint)], None),
+    "alGetAuxiliaryEffectSlotf": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    "alGetAuxiliaryEffectSlotfv": ([ALuint, ALenum, POINTER(ALfloat)], None),
+    }
+dll.bind_functions(globals(), _FUNCTIONS)
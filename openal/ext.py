@@ -1,2 +1,34 @@
 """OpenAL extensions"""
-__all__ = []
+import ctypes
+from . import al
+
+__all__ = ["AL_EXT_FLOAT32_NAME", "AL_FORMAT_MONO_FLOAT32",
+           "AL_FORMAT_STEREO_FLOAT32", "AL_SOFT_DEFERRED_UPDATES_NAME",
+           "AL_DEFERRED_UPDATES_SOFT", "get_deferred_updates_functions"]
+
+# AL_EXT_float32
+AL_EXT_FLOAT32_NAME = "AL_EXT_float32"
+AL_FORMAT_MONO_FLOAT32 = 0x10010
+AL_FORMAT_STEREO_FLOAT32 = 0x10011
+
+# AL_SOFT_deferred_updates
+AL_SOFT_DEFERRED_UPDATES_NAME = "AL_SOFT_deferred_updates"
+AL_DEFERRED_UPDATES_SOFT = 0xC002
+_LPALDEFERUPDATESSOFT = ctypes.CFUNCTYPE(None)
+_LPALPROCESSUPDATESSOFT = ctypes.CFUNCTYPE(None)
+
+
+def get_deferred_updates_functions():
+    """Gets the alDeferUpdatesSOFT and alProcessUpdatesSOFT functions of the
+    AL_SOFT_deferred_updates extension for the current context.
+
+    Returns (None, None), if the extension is not supported.
+    """
+    name = AL_SOFT_DEFERRED_UPDATES_NAME.encode("ascii")
+    if ord(al.alIsExtensionPresent(name)) == al.AL_FALSE:
+        return None, None
+    defer = al.alGetProcAddress(b"alDeferUpdatesSOFT")
+    process = al.alGetProcAddress(b"alProcessUpdatesSOFT")
+    if not defer or not process:
+        return None, None
+    return _LPALDEFERUPDATESSOFT(defer), _LPALPROCESSUPDATESSOFT(process)
@@ -1,15 +1,96 @@
 """Utility functions for loading sounds."""
+from collections import OrderedDict, namedtuple
+import functools
+import mmap
 import os
+import struct
 import sys
+import threading
 import wave
-from ..audio import SoundData
+from ..audio import SoundData, StreamingSoundData
 
 
-__all__ = ["load_wav_file", "load_file"]
+__all__ = ["load_wav_file", "load_file", "load_files", "load_stream",
+           "cache_info", "set_cache_limit",
+           "invalidate_cache", "CacheInfo"]
 
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# Data chunk sizes used by streaming encoders, which do not know the final
+# size of the data.
+_WAVE_UNKNOWN_SIZES = (0, 0xFFFFFFFF)
 
-def load_wav_file(fname):
-    """Loads a WAV encoded audio file into a SoundData object."""
+
+def _read_exactly(fp, size):
+    """Reads exactly size bytes from the file-like object."""
+    buf = fp.read(size)
+    while len(buf) < size:
+        more = fp.read(size - len(buf))
+        if not more:
+            raise ValueError("unexpected end of WAV data")
+        buf += more
+    return buf
+
+
+def _skip(fp, size):
+    """Skips size bytes of the file-like object."""
+    try:
+        fp.seek(size, os.SEEK_CUR)
+    except (AttributeError, IOError, OSError, ValueError):
+        # Not seekable, e.g. a pipe or socket
+        while size > 0:
+            size -= len(_read_exactly(fp, min(size, 65536)))
+
+
+def _read_wav_header(fp):
+    """Reads the RIFF chunks of a WAV file up to the start of the PCM data.
+
+    Returns the channels, bits per sample, sample rate and the size of the
+    PCM data in bytes. The file-like object is placed at the start of the
+    PCM data.
+    """
+    riff, _, wavetype = struct.unpack("<4sI4s", _read_exactly(fp, 12))
+    if riff != b"RIFF" or wavetype != b"WAVE":
+        raise ValueError("not a WAV file")
+    fmt = None
+    while True:
+        chunkid, chunksize = struct.unpack("<4sI", _read_exactly(fp, 8))
+        # Chunks are padded to an even size
+        padded = chunksize + (chunksize & 1)
+        if chunkid == b"fmt ":
+            chunk = _read_exactly(fp, padded)
+            fmt = struct.unpack("<HHIIHH", chunk[:16])
+            if fmt[0] == _WAVE_FORMAT_EXTENSIBLE and chunksize >= 26:
+                # The sub format GUID starts with the format tag
+                fmt = (struct.unpack("<H", chunk[24:26])[0],) + fmt[1:]
+        elif chunkid == b"data":
+            if fmt is None:
+                raise ValueError("missing WAV format information")
+            break
+        else:
+            _skip(fp, padded)
+    formattag, channels, samplerate, _, _, bits = fmt
+    if formattag != _WAVE_FORMAT_PCM:
+        raise ValueError("unsupported WAV format %d" % formattag)
+    return channels, bits, samplerate, chunksize
+
+
+def load_wav_file(fname, use_mmap=False):
+    """Loads a WAV encoded audio file into a SoundData object.
+
+    If use_mmap is True, the file is memory-mapped and the data of the
+    SoundData is a read-only memoryview of the PCM data within the file.
+    """
+    if use_mmap:
+        with open(fname, "rb") as fp:
+            channels, bitrate, samplerate, size = _read_wav_header(fp)
+            offset = fp.tell()
+            mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        size = min(size, len(mapping) - offset)
+        # The OpenAL formats require complete sample frames.
+        size -= size % (channels * bitrate // 8)
+        buf = memoryview(mapping)[offset:offset + size]
+        return SoundData(buf, channels, bitrate, size, samplerate)
     fp = wave.open(fname, "rb")
     channels = fp.getnchannels()
     bitrate = fp.getsampwidth() * 8
@@ -22,15 +103,228 @@ def load_wav_file(fname):
 _FILEEXTENSIONS = {".wav": load_wav_file}
 
 
-def load_file(fname):
-    """Loads an audio file into a SoundData object."""
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "count", "size",
+                                     "limit"])
+
+
+class _SoundCache(object):
+    """A least recently used cache of loaded SoundData objects, limited by
+    the total size of their PCM data."""
+    def __init__(self, limit):
+        self.limit = limit
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # path -> ((file size, mtime), SoundData), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, signature):
+        """Gets the SoundData loaded from the path or None, if it is not
+        cached or the file changed meanwhile."""
+        with self._lock:
+            entry = self._entries.get(path, None)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+    def add(self, path, signature, sounddata):
+        """Adds the SoundData loaded from the path to the cache."""
+        size = sounddata.size or 0
+        if size > self.limit:
+            return
+        with self._lock:
+            self._remove(path)
+            self._entries[path] = (signature, sounddata)
+            self.size += size
+            self._evict()
+
+    def invalidate(self, path=None):
+        """Removes the SoundData loaded from path or all entries, if path is
+        None, from the cache."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.size = 0
+            else:
+                self._remove(path)
+
+    def set_limit(self, limit):
+        """Changes the size limit, evicting entries, if necessary."""
+        with self._lock:
+            self.limit = limit
+            self._evict()
+
+    def info(self):
+        """Gets the cache statistics."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries),
+                             self.size, self.limit)
+
+    def _remove(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.size -= entry[1].size or 0
+
+    def _evict(self):
+        while self.size > self.limit:
+            entry = self._entries.popitem(last=False)[1]
+            self.size -= entry[1].size or 0
+
+
+_cache = _SoundCache(128 * 1024 * 1024)
+
+
+def load_file(fname, cache=True):
+    """Loads an audio file into a SoundData object.
+
+    If cache is True, the loaded SoundData is kept in a process-wide cache
+    and returned again for subsequent calls, as long as the file is not
+    changed.
+    """
     ext = os.path.splitext(fname)[1].lower()
     funcptr = _FILEEXTENSIONS.get(ext, None)
     if not funcptr:
         raise ValueError("unsupported audio file type")
-    return funcptr(fname)
+    if not cache:
+        return funcptr(fname)
+    path = os.path.abspath(fname)
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime)
+    sounddata = _cache.get(path, signature)
+    if sounddata is None:
+        sounddata = funcptr(fname)
+        _cache.add(path, signature, sounddata)
+    return sounddata
+
+
+def load_files(fnames, workers=None, ordered=True, use_processes=False,
+               cache=True):
+    """Loads multiple audio files in parallel.
+
+    The files are loaded via load_file() by a pool of worker threads or, if
+    use_processes is True, worker processes. workers is the size of the
+    pool and defaults to the pool's default size.
+
+    If ordered is True, a list of the SoundData objects in the order of
+    fnames is returned. Otherwise an iterator is returned, which yields
+    (fname, SoundData) tuples as soon as the files are loaded.
+
+    Worker processes do not share the load_file() cache, so cache is ignored
+    for use_processes=True.
+    """
+    from concurrent import futures
+    fnames = list(fnames)
+    if use_processes:
+        executor = futures.ProcessPoolExecutor(workers)
+        loadfunc = functools.partial(load_file, cache=False)
+    else:
+        executor = futures.ThreadPoolExecutor(workers)
+        loadfunc = functools.partial(load_file, cache=cache)
+    if ordered:
+        with executor:
+            return list(executor.map(loadfunc, fnames))
+    return _load_completed(executor, loadfunc, fnames)
+
+
+def _load_completed(executor, loadfunc, fnames):
+    """Yields (fname, SoundData) tuples in the order the files are loaded."""
+    from concurrent import futures
+    with executor:
+        pending = dict((executor.submit(loadfunc, fname), fname)
+                       for fname in fnames)
+        try:
+            for future in futures.as_completed(pending):
+                yield pending[future], future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def cache_info():
+    """Gets the hits, misses, amount of entries, size in bytes and the size
+    limit of the load_file() cache as CacheInfo."""
+    return _cache.info()
+
+
+def set_cache_limit(limit):
+    """Sets the maximum size in bytes of the PCM data kept in the
+    load_file() cache. The least recently used sounds are evicted first."""
+    _cache.set_limit(limit)
+
+
+def invalidate_cache(fname=None):
+    """Removes the file or, if fname is None, all files from the load_file()
+    cache."""
+    if fname is not None:
+        fname = os.path.abspath(fname)
+    _cache.invalidate(fname)
+
+
+class _WavStream(object):
+    """A file-like object, which reads the PCM data of a WAV stream."""
+    def __init__(self, fp, size=None):
+        """Creates a new _WavStream for the file-like object, which must be
+        placed at the start of the PCM data. If size is None, the data is
+        read until the file-like object is exhausted."""
+        self._fp = fp
+        self._size = size
+        self._pos = 0
+        try:
+            self._start = fp.tell()
+        except (AttributeError, IOError, OSError, ValueError):
+            # Not seekable, e.g. a pipe or socket
+            self._start = None
+
+    def read(self, size=None):
+        """Reads up to size bytes of PCM data."""
+        if self._size is not None:
+            remaining = self._size - self._pos
+            if size is None or size < 0 or size > remaining:
+                size = remaining
+        if size is None or size < 0:
+            buf = self._fp.read()
+        elif size == 0:
+            return b""
+        else:
+            buf = self._fp.read(size)
+        self._pos += len(buf)
+        return buf
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Moves to the offset within the PCM data."""
+        if self._start is None:
+            raise IOError("stream is not seekable")
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            if self._size is None:
+                raise IOError("stream size is unknown")
+            offset += self._size
+        offset = max(offset, 0)
+        if self._size is not None:
+            offset = min(offset, self._size)
+        self._fp.seek(self._start + offset)
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        """Gets the current offset within the PCM data."""
+        return self._pos
 
 
 def load_stream(source):
-    """Loads an audio stream into a SoundData object."""
-    raise NotImplementedError("not implemented yet")
+    """Loads a WAV encoded audio stream into a StreamingSoundData object.
+
+    source can be any readable file-like object, such as a file, pipe or
+    socket file. Only the WAV header is read, the PCM data is read in
+    chunks while the StreamingSoundData is played.
+    """
+    channels, bitrate, samplerate, size = _read_wav_header(source)
+    if size in _WAVE_UNKNOWN_SIZES:
+        size = None
+    return StreamingSoundData(_WavStream(source, size), channels, bitrate,
+                              size, samplerate)
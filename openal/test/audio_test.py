@@ -1,8 +1,23 @@
+import array
+import gc
+import io
 import sys
+import time
 import unittest
-from .. import al
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from .. import al, ext, dll, set_call_stats_enabled, get_call_stats, \
+    reset_call_stats
 from ..audio import OpenALError, SoundData, SoundListener, SoundSource, \
-    SoundSink
+    SoundSink, SinkStats, SourceArray, SourceSnapshot, StreamingSoundData, \
+    _BufferCache, _NamePool, _SpatialGrid, _get_listener_value, \
+    _get_source_value, _pop_changes, _SOURCECALLBACKS, _LISTENERCALLBACKS
 
 
 class OpenALAudioTest(unittest.TestCase):
@@ -62,6 +77,66 @@ class OpenALAudioTest(unittest.TestCase):
             data.bitrate = v
             self.assertEqual(data.bitrate, v)
 
+    def test_SoundData_buffer_protocol(self):
+        buffers = (b"\0\0" * 10, bytearray(20), array.array("h", [0] * 10),
+                   memoryview(b"\0\0" * 12)[4:])
+        sink = SoundSink()
+        sink.activate()
+        source = SoundSource()
+        for buf in buffers:
+            data = SoundData(buf, 1, 16, None, 44100)
+            self.assertEqual(data.size, 20)
+            source.queue(data)
+        sink.play(source)
+        sink.update()
+        self.assertEqual(len(source.bufferqueue), 0)
+
+        source.queue(SoundData(b"\0\0\0", 1, 16, None, 44100))
+        self.assertRaises(ValueError, sink.update)
+        source.bufferqueue = []
+        source.queue(SoundData(memoryview(bytearray(40))[::2], 1, 16, None,
+                               44100))
+        self.assertRaises(ValueError, sink.update)
+        del sink
+
+    @unittest.skipIf(numpy is None, "numpy is not available")
+    def test_SoundData_from_array(self):
+        mono = numpy.array([-1.0, -0.5, 0, 0.5, 0.99], dtype=numpy.float64)
+        data = SoundData.from_array(mono, 22050)
+        self.assertEqual(data.format, ext.AL_FORMAT_MONO_FLOAT32)
+        self.assertEqual(data.channels, 1)
+        self.assertEqual(data.bitrate, 32)
+        self.assertEqual(data.size, 20)
+        self.assertEqual(data.frequency, 22050)
+
+        data = SoundData.from_array(mono, 22050, numpy.int16)
+        self.assertEqual(data.format, al.AL_FORMAT_MONO16)
+        self.assertEqual(data.size, 10)
+        self.assertEqual(data.as_array().tolist(),
+                         [-32768, -16384, 0, 16384, 32440])
+
+        stereo = numpy.zeros((10, 2), dtype=numpy.uint8)
+        data = SoundData.from_array(stereo, 44100)
+        self.assertEqual(data.format, al.AL_FORMAT_STEREO8)
+        self.assertEqual(data.as_array().shape, (10, 2))
+        self.assertEqual(data.as_array(numpy.int16).dtype, numpy.int16)
+        self.assertEqual(data.as_array(numpy.float32).tolist()[0],
+                         [-1.0, -1.0])
+
+        self.assertRaises(ValueError, SoundData.from_array,
+                          numpy.zeros((2, 2, 2)), 44100)
+        self.assertRaises(ValueError, SoundData.from_array,
+                          numpy.zeros((10, 3)), 44100)
+
+    @unittest.skipIf(numpy is None, "numpy is not available")
+    def test_SoundData_as_array(self):
+        data = SoundData(b"\x00\x80\xff\x7f", 1, 16, None, 44100)
+        arr = data.as_array()
+        self.assertEqual(arr.dtype, numpy.int16)
+        self.assertEqual(arr.tolist(), [-32768, 32767])
+        self.assertEqual(data.as_array(numpy.uint8).tolist(), [0, 255])
+        self.assertEqual(data.as_array(numpy.float32).tolist()[0], -1.0)
+
     def test_SoundListener(self):
         listener = SoundListener()
         self.assertIsInstance(listener, SoundListener)
@@ -140,6 +215,505 @@ class OpenALAudioTest(unittest.TestCase):
                 self.assertTrue(source.changed)
                 self.assertTrue(dprop in source.changedproperties)
 
+    def test_SoundSource_slots(self):
+        source = SoundSource()
+        self.assertRaises(AttributeError, setattr, source, "invalid", 1)
+        self.assertRaises(AttributeError, getattr, source, "invalid")
+        self.assertIsNone(source.direction)
+        source.changedproperties = []
+        source.position = [1, 2, 3]
+        source.position = [3, 2, 1]
+        self.assertEqual(source.changedproperties, set([al.AL_POSITION]))
+        del source.position
+        self.assertIsNone(source.position)
+
+        listener = SoundListener()
+        self.assertRaises(AttributeError, setattr, listener, "pitch", 1)
+
+    def test_SoundSink_virtual_voices(self):
+        sink = SoundSink()
+        sink.MAX_VOICES = 2
+        sink.activate()
+        data = SoundData(b"\0\0" * 44100, 1, 16, None, 44100)
+        low1, low2 = SoundSource(), SoundSource()
+        high = SoundSource(priority=5)
+        self.assertEqual(low1.priority, 0)
+        for source in (low1, low2, high):
+            source.queue(data)
+        sink.play([low1, low2, high])
+        self.assertEqual(len(sink._sources), 2)
+        self.assertIn(high, sink._virtual)
+
+        # The higher priority source steals a voice on the next update.
+        sink.update()
+        self.assertIn(high, sink._sources)
+        self.assertEqual(len(sink._sources), 2)
+        virtual = [source for source in (low1, low2)
+                   if source in sink._virtual]
+        self.assertEqual(len(virtual), 1)
+        voice = sink._virtual[virtual[0]]
+        self.assertEqual(voice.state, al.AL_PLAYING)
+        self.assertEqual(list(voice.entries), [data])
+
+        # Virtual voices keep playing and stop at the end of their sounds.
+        sink.pause(virtual[0])
+        self.assertEqual(voice.state, al.AL_PAUSED)
+        sink.play(virtual[0])
+        self.assertEqual(voice.state, al.AL_PLAYING)
+        sink._advance_virtual(0.5, virtual)
+        self.assertAlmostEqual(voice.offset, 0.5)
+        sink._advance_virtual(0.6, virtual)
+        self.assertEqual(voice.state, al.AL_STOPPED)
+        self.assertEqual(len(voice.entries), 0)
+
+        # A detached source frees its voice for the virtual ones.
+        virtual[0].queue(data)
+        sink.detach(high)
+        sink.update()
+        self.assertIn(virtual[0], sink._sources)
+        self.assertEqual(len(sink._virtual), 0)
+        sink.detach(virtual[0])
+        del sink
+
+    def test_SoundSink_virtual_voices_stream(self):
+        sink = SoundSink()
+        sink.MAX_VOICES = 1
+        sink.activate()
+        pcm = io.BytesIO(b"\0" * (sink.MAX_BUFFER_SIZE * 3 + 6000))
+        stream = StreamingSoundData(pcm, 1, 16, None, 44100)
+        source = SoundSource()
+        source.queue(stream)
+        sink.play(source)
+        for index in range(3):
+            sink.update()
+        self.assertNotIn(source, sink._streams)
+        self.assertTrue(sink._queued[source])
+
+        # Exhausted streams, which still play their last chunks, are not
+        # stolen.
+        high = SoundSource(priority=5)
+        high.queue(SoundData(b"\0\0" * 100, 1, 16, None, 44100))
+        sink.play(high)
+        sink.update()
+        self.assertIn(source, sink._sources)
+        self.assertIn(high, sink._virtual)
+        sink.detach(high)
+        sink.update()
+        self.assertIn(source, sink._sources)
+        self.assertEqual(len(sink._virtual), 0)
+        del sink
+
+    def test_SoundSink_update_changed(self):
+        sink = SoundSink()
+        sink.activate()
+        data = SoundData(b"\0\0" * 100, 1, 16, None, 44100)
+        sources = [SoundSource() for index in range(10)]
+        for source in sources:
+            source.queue(data)
+        sink.play(sources)
+        for index in range(5):
+            sink.update()
+        self.assertEqual(len(sink._queued), 0)
+
+        processed = []
+        process_source = sink.process_source
+
+        def _process(source):
+            processed.append(source)
+            process_source(source)
+        sink.process_source = _process
+        sink.update()
+        self.assertEqual(processed, [])
+
+        sources[3].gain = 0.5
+        sink.update()
+        self.assertEqual(processed, [sources[3]])
+        self.assertFalse(sources[3].changed)
+
+        del processed[:]
+        sources[5].queue(data)
+        sink.update()
+        self.assertEqual(processed, [sources[5]])
+        self.assertEqual(len(sources[5].bufferqueue), 0)
+        self.assertIn(sources[5], sink._queued)
+        del sink
+
+    def test_SoundSink_update_batch(self):
+        sink = SoundSink()
+        sink.activate()
+        sink.update()
+        defer, process = sink._batch
+        self.assertTrue(callable(defer))
+        self.assertTrue(callable(process))
+
+        calls = []
+        process_source = sink.process_source
+
+        def _process(source):
+            calls.append("source")
+            process_source(source)
+        sink.process_source = _process
+        sink._batch = (lambda: calls.append("defer"),
+                       lambda: calls.append("process"))
+        source = SoundSource()
+        sink.play(source)
+        sink.update()
+        self.assertEqual(calls, ["defer", "source", "process"])
+
+        del calls[:]
+        source.queue(SoundData(b"\0\0\0", 1, 16, None, 44100))
+        self.assertRaises(ValueError, sink.update)
+        self.assertEqual(calls, ["defer", "source", "process"])
+        del sink
+
+    def test_SoundSink_error_mode(self):
+        self.assertRaises(ValueError, SoundSink, error_mode="invalid")
+        sink = SoundSink(error_mode="deferred")
+        self.assertEqual(sink.error_mode, "deferred")
+        sink.activate()
+        source = SoundSource()
+        sink.play(source)
+        sink.update()
+
+        # An unknown source id causes an AL_INVALID_NAME error
+        al.alSourcef(100000, al.AL_GAIN, 1.0)
+        with self.assertRaises(OpenALError) as ctx:
+            sink.update()
+        self.assertEqual(ctx.exception.errcode, al.AL_INVALID_NAME)
+        self.assertIn("before update()", ctx.exception.msg)
+
+        sid = sink._sources[source]
+        sink._sources[source] = 100000
+        source.gain = 0.5
+        with self.assertRaises(OpenALError) as ctx:
+            sink.update()
+        self.assertIn("source update", ctx.exception.msg)
+
+        sink.error_mode = "off"
+        source.gain = 0.25
+        sink.update()
+        self.assertEqual(al.alGetError(), al.AL_INVALID_NAME)
+
+        sink.error_mode = "strict"
+        source.gain = 0.5
+        self.assertRaises(OpenALError, sink.update)
+        sink._sources[source] = sid
+        del sink
+
+    def test_SoundSink_error_mode_off(self):
+        sink = SoundSink(error_mode="off")
+        sink.activate()
+        # Unchecked errors are not taken for allocation failures.
+        al.alSourcef(100000, al.AL_GAIN, 1.0)
+        source = SoundSource()
+        sink.play(source)
+        self.assertIn(source, sink._sources)
+        self.assertIsNone(sink._voicelimit)
+        self.assertEqual(len(sink._sourcepool), sink.SOURCE_BLOCK_SIZE - 1)
+
+        # AL_SOURCE_TYPE is read-only and causes an AL_INVALID_ENUM error
+        source.source_type = al.AL_STATIC
+        sink.update()
+        other = SoundSource()
+        other.queue(SoundData(b"\0\0" * 100, 1, 16, None, 44100))
+        sink.play(other)
+        sink.update()
+        self.assertIn(other, sink._sources)
+        self.assertEqual(len(other.bufferqueue), 0)
+        del sink
+
+    def test_SoundSink_snapshot(self):
+        sink = SoundSink()
+        sink.MAX_VOICES = 2
+        sink.activate()
+        data = SoundData(b"\0\0" * 100, 1, 16, None, 44100)
+        sources = [SoundSource() for index in range(3)]
+        for source in sources:
+            source.queue(data)
+            source.queue(data)
+        self.assertEqual(len(sink.snapshot()), 0)
+        sink.play(sources[:2])
+        sink.update()
+
+        snapshot = sink.snapshot()
+        self.assertIsInstance(snapshot, SourceSnapshot)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(set(snapshot.sources), set(sources[:2]))
+        self.assertEqual(snapshot.source_state.tolist(),
+                         [al.AL_PLAYING] * 2)
+        self.assertEqual(snapshot.buffers_queued.tolist(), [2, 2])
+
+        # Unattached and virtual sources
+        other = SoundSource()
+        sink.play(sources[2])
+        again = sink.snapshot([other, sources[2]], out=snapshot)
+        self.assertIs(again, snapshot)
+        self.assertEqual(snapshot.sources, [other, sources[2]])
+        self.assertEqual(snapshot.source_state.tolist(),
+                         [al.AL_INITIAL, al.AL_PLAYING])
+        self.assertEqual(snapshot.buffers_queued.tolist(), [0, 0])
+        self.assertEqual(snapshot.buffers_processed.tolist(), [0, 0])
+        self.assertEqual(snapshot.sec_offset.tolist(), [0.0, 0.0])
+        if numpy is not None:
+            self.assertEqual(numpy.asarray(snapshot.source_state).dtype,
+                             numpy.int32)
+        del sink
+
+    def test_SoundSink_stats(self):
+        sink = SoundSink()
+        sink.activate()
+        stats = sink.stats()
+        self.assertIsInstance(stats, SinkStats)
+        self.assertEqual(stats.sources_used, 0)
+        self.assertEqual(stats.buffers, {})
+        self.assertEqual(stats.bytes_uploaded, 0)
+        self.assertEqual(stats.updates, 0)
+        self.assertEqual(stats.update_latencies, ())
+
+        data = SoundData(b"\0\0" * 100, 1, 16, None, 44100)
+        source = SoundSource()
+        source.queue(data)
+        source.queue(data)
+        sink.play(source)
+        sink.update()
+        stats = sink.stats()
+        self.assertEqual(stats.sources_used, 1)
+        self.assertEqual(stats.sources_free, sink.SOURCE_BLOCK_SIZE - 1)
+        self.assertEqual(stats.virtual_voices, 0)
+        self.assertEqual(stats.buffers, {source: (2, 0)})
+        # The SoundData is uploaded only once.
+        self.assertEqual(stats.bytes_uploaded, 200)
+        self.assertGreater(stats.upload_rate, 0)
+        self.assertEqual(stats.updates, 1)
+        self.assertEqual(sum(n for _, n in stats.update_latencies), 1)
+        sink.update()
+        stats = sink.stats()
+        self.assertEqual(stats.buffers, {source: (1, 1)})
+        self.assertEqual(stats.upload_rate, 0)
+        self.assertEqual(stats.updates, 2)
+
+        # A stream, which stopped while it still has data, underran.
+        pcm = io.BytesIO(b"\0\0" * sink.MAX_BUFFER_SIZE * 8)
+        stream = StreamingSoundData(pcm, 1, 16, None, 44100)
+        other = SoundSource()
+        other.queue(stream)
+        sink.play(other)
+        sink.update()
+        self.assertEqual(sink.stats().underruns, 0)
+        al.alSourceStop(sink._sources[other])
+        sink.update()
+        stats = sink.stats()
+        self.assertEqual(stats.underruns, 1)
+        self.assertEqual(stats.bytes_uploaded,
+                         200 + 2 * sink.STREAM_BUFFERS * sink.MAX_BUFFER_SIZE)
+        sink.detach(other)
+        self.assertNotIn(other, sink.stats().buffers)
+        del sink
+
+    def test_SoundSink_call_stats(self):
+        enabled = dll.instrumented
+        sink = SoundSink()
+        sink.activate()
+        source = SoundSource()
+        sink.play(source)
+        sink.update()
+        sid = sink._sources[source]
+        try:
+            set_call_stats_enabled(True)
+            reset_call_stats()
+            source.gain = 0.5
+            source.position = [1, 2, 3]
+            sink.listener.position = [4, 5, 6]
+            sink.update()
+            stats = get_call_stats()
+            self.assertEqual(stats["alSourcef"].calls, 1)
+            self.assertEqual(stats["alSource3f"].calls, 1)
+            self.assertEqual(stats["alListener3f"].calls, 1)
+            self.assertEqual(stats["alcSuspendContext"].calls, 1)
+            self.assertEqual(stats["alcProcessContext"].calls, 1)
+            self.assertNotIn("alSourcefv", stats)
+            self.assertNotIn("alListenerfv", stats)
+
+            set_call_stats_enabled(False)
+            for table in (_SOURCECALLBACKS, _LISTENERCALLBACKS):
+                for entry in table.values():
+                    for value in entry:
+                        self.assertFalse(hasattr(value, "__wrapped__"))
+            source.gain = 0.25
+            source.position = [3, 2, 1]
+            sink.update()
+            self.assertEqual(get_call_stats()["alSourcef"].calls, 1)
+            self.assertEqual(get_call_stats()["alcProcessContext"].calls, 1)
+            self.assertEqual(_get_source_value(sid, al.AL_GAIN)[0], 0.25)
+            self.assertEqual(list(_get_source_value(sid, al.AL_POSITION)),
+                             [3, 2, 1])
+        finally:
+            set_call_stats_enabled(enabled)
+            reset_call_stats()
+        del sink
+
+    def test_SoundSink_property_values(self):
+        sink = SoundSink()
+        sink.activate()
+        source = SoundSource(gain=0.5, position=[1, 2, 3])
+        sink.listener.position = [4, 5, 6]
+        sink.play(source)
+        sink.update()
+        sid = sink._sources[source]
+        out = (al.ALfloat * 3)()
+        self.assertIs(_get_source_value(sid, al.AL_POSITION, out), out)
+        self.assertEqual(list(out), [1, 2, 3])
+        gain = (al.ALfloat * 1)()
+        self.assertIs(_get_source_value(sid, al.AL_GAIN, gain), gain)
+        self.assertEqual(gain[0], 0.5)
+        self.assertIs(_get_listener_value(al.AL_POSITION, out), out)
+        self.assertEqual(list(out), [4, 5, 6])
+        self.assertEqual(list(_get_listener_value(al.AL_POSITION)),
+                         [4, 5, 6])
+        del sink
+
+    def test_SoundSink_culling(self):
+        sink = SoundSink()
+        sink.CULL_DISTANCE = 10
+        sink.activate()
+        data = SoundData(b"\0\0" * 100, 1, 16, None, 44100)
+        near = SoundSource(position=[1, 0, 0])
+        far = SoundSource(position=[100, 0, 0])
+        relative = SoundSource(position=[100, 0, 0])
+        relative.source_relative = True
+        limited = SoundSource(position=[5, 0, 0])
+        limited.max_distance = 2
+        sources = (near, far, relative, limited)
+        for source in sources:
+            source.queue(data)
+        sink.play(sources)
+        sink.update()
+        self.assertEqual([len(source.bufferqueue) for source in sources],
+                         [0, 1, 0, 1])
+        self.assertIn(far, sink._pending)
+
+        far.position = [0, 5, 5]
+        sink.update()
+        self.assertEqual(len(far.bufferqueue), 0)
+        self.assertFalse(far.changed)
+
+        sink.listener.position = [0, 0, 100]
+        near.queue(data)
+        sink.update()
+        self.assertEqual(len(near.bufferqueue), 1)
+
+        for source in sources:
+            sink.detach(source)
+        self.assertEqual(len(sink._grid), 0)
+        self.assertIsNone(near._observer)
+        del sink
+
+    def test_SoundSink_culling_playing(self):
+        sink = SoundSink()
+        sink.CULL_DISTANCE = 10
+        sink.MAX_VOICES = 1
+        sink.activate()
+        data = SoundData(b"\0\0" * 100, 1, 16, None, 44100)
+        near = SoundSource(position=[1, 0, 0])
+        near.looping = True
+        near.queue(data)
+        sink.play(near)
+        sink.update()
+
+        # Changes of playing sources leaving the range are applied.
+        near.position = [50, 0, 0]
+        near.gain = 0.0
+        for index in range(3):
+            sink.update()
+        sid = sink._sources[near]
+        self.assertEqual(list(_get_source_value(sid, al.AL_POSITION)),
+                         [50, 0, 0])
+        self.assertEqual(_get_source_value(sid, al.AL_GAIN)[0], 0.0)
+        self.assertFalse(near.changed)
+
+        # Culled virtual voices keep playing and stop at their end.
+        far = SoundSource(position=[100, 0, 0])
+        far.priority = -1
+        far.queue(SoundData(b"\0\0" * 44100, 1, 16, None, 44100))
+        sink.play(far)
+        sink.update()
+        self.assertIn(far, sink._virtual)
+        self.assertEqual(sink._virtual[far].state, al.AL_PLAYING)
+        sink._lastupdate -= 2.0
+        sink.update()
+        self.assertEqual(sink._virtual[far].state, al.AL_STOPPED)
+        del sink
+
+    def test_SpatialGrid(self):
+        grid = _SpatialGrid(10)
+        grid.move("a", (0, 0, 0))
+        grid.move("b", (25, 0, 0))
+        grid.move("c", (-9, -9, -9))
+        self.assertEqual(len(grid), 3)
+        self.assertEqual(sorted(grid.query((0, 0, 0), 20)), ["a", "c"])
+        self.assertEqual(sorted(grid.query((20, 0, 0), 10)), ["b"])
+        self.assertEqual(sorted(grid.query((0, 0, 0), 30,
+                                           lambda obj: 5)), ["a"])
+        grid.move("b", (1, 1, 1))
+        self.assertEqual(sorted(grid.query((0, 0, 0), 5)), ["a", "b"])
+        grid.remove("a")
+        grid.remove("a")
+        self.assertNotIn("a", grid)
+        self.assertEqual(sorted(grid.query((0, 0, 0), 5)), ["b"])
+
+    def test_SourceArray(self):
+        sources = SourceArray(4, gain=0.5)
+        self.assertEqual(len(sources), 4)
+        self.assertIsInstance(sources[0], SoundSource)
+        self.assertEqual(sources.position.shape, (4, 3))
+        self.assertEqual(sources.gain.tolist(), [0.5] * 4)
+        self.assertEqual(sources.pitch.tolist(), [1.0] * 4)
+        self.assertRaises(ValueError, SourceArray, 0)
+
+        sink = SoundSink()
+        sink.activate()
+        sink.play(sources)
+        sources.position[1, 0] = 2.5
+        sink.update()
+        sids = [sink._sources[source] for source in sources]
+        values = [list(_get_source_value(sid, al.AL_POSITION))
+                  for sid in sids]
+        self.assertEqual(values, [[0, 0, 0], [2.5, 0, 0], [0, 0, 0],
+                                  [0, 0, 0]])
+        self.assertEqual(_get_source_value(sids[3], al.AL_GAIN)[0], 0.5)
+        self.assertEqual(list(sources._changes()), [])
+
+        sources.velocity[3, 2] = -1
+        sources.pitch[0] = 2
+        changes = [(prop, rows) for prop, _, _, rows in sources._changes()]
+        self.assertEqual(changes, [(al.AL_VELOCITY, [3]),
+                                   (al.AL_PITCH, [0])])
+
+        sink.detach(sources[2])
+        sources.position[2, 1] = 4
+        sink.update()
+        sink.play(sources[2])
+        sink.update()
+        sid = sink._sources[sources[2]]
+        self.assertEqual(list(_get_source_value(sid, al.AL_POSITION)),
+                         [0, 4, 0])
+
+        sink.detach(sources)
+        self.assertEqual(len(sink._sources), 0)
+        self.assertRaises(ValueError, sink.detach, sources)
+        del sink
+
+    @unittest.skipIf(numpy is None, "numpy is not available")
+    def test_SourceArray_numpy(self):
+        sources = SourceArray(100)
+        positions = numpy.asarray(sources.position)
+        positions[:] = numpy.arange(300).reshape(100, 3)
+        self.assertEqual(sources.position[99, 2], 299)
+        changes = dict((prop, rows) for prop, _, _, rows in
+                       sources._changes())
+        self.assertEqual(changes[al.AL_POSITION], list(range(100)))
+        self.assertNotIn(al.AL_VELOCITY, changes)
+
     def test_SoundSink(self):
         sink = SoundSink()
         self.assertIsNotNone(sink.device)
@@ -149,6 +723,202 @@ class OpenALAudioTest(unittest.TestCase):
         #self.assertEqual(sink2.device, sink.device)
         del sink
 
+    def test_SoundSink_detach(self):
+        sink = SoundSink()
+        sink.activate()
+        source = SoundSource()
+        self.assertRaises(ValueError, sink.detach, source)
+        sink.play(source)
+        source.looping = True
+        sink.update()
+        self.assertFalse(source.changed)
+        sink.detach(source)
+        self.assertRaises(ValueError, sink.detach, source)
+        self.assertRaises(ValueError, sink.refresh, source)
+        # All properties are applied again on reattaching
+        self.assertTrue(source.changed)
+        self.assertTrue(al.AL_LOOPING in source.changedproperties)
+        sink.play(source)
+        del sink
+
+    def test_SoundSink_streaming(self):
+        sink = SoundSink()
+        sink.activate()
+        pcm = io.BytesIO(b"\0\0" * sink.MAX_BUFFER_SIZE * 4)
+        stream = StreamingSoundData(pcm, 1, 16, None, 44100)
+        source = SoundSource()
+        source.queue(stream)
+        sink.play(source)
+        sink.update()
+        # Only the ring buffer chunks are read from the stream.
+        self.assertEqual(pcm.tell(),
+                         sink.STREAM_BUFFERS * sink.MAX_BUFFER_SIZE)
+        self.assertEqual(len(source.bufferqueue), 0)
+        sink.stop(source)
+        sink.update()
+        self.assertEqual(pcm.tell(),
+                         sink.STREAM_BUFFERS * sink.MAX_BUFFER_SIZE)
+        del sink
+
+    def test_SoundSink_update_thread(self):
+        sink = SoundSink()
+        sink.activate()
+        self.assertFalse(sink.updating)
+        sink.start_update_thread(100)
+        self.assertTrue(sink.updating)
+        self.assertRaises(RuntimeError, sink.start_update_thread)
+        source = SoundSource()
+        source.queue(SoundData(b"\0\0" * 100, 1, 16, 200, 44100))
+        sink.play(source)
+        sink.stop_update_thread()
+        self.assertFalse(sink.updating)
+        self.assertEqual(len(source.bufferqueue), 0)
+        # Errors of handed over calls are raised on stopping the thread,
+        # but do not stop it.
+        sink.start_update_thread(100)
+        sink.detach(SoundSource())
+        other = SoundSource()
+        sink.play(other)
+        sink.update()
+        for retry in range(100):
+            if other in sink._sources:
+                break
+            time.sleep(0.01)
+        self.assertTrue(sink.updating)
+        self.assertIn(other, sink._sources)
+        self.assertRaises(ValueError, sink.stop_update_thread)
+        self.assertFalse(sink.updating)
+
+        # Errors of update() stop the thread and are raised by the next
+        # call, which continues without the thread.
+        def _update():
+            raise OpenALError("update failed")
+        sink._update = _update
+        sink.start_update_thread(100)
+        sink._thread.join(1)
+        self.assertFalse(sink.updating)
+        del sink._update
+        self.assertRaises(OpenALError, sink.play, source)
+        self.assertIsNone(sink._thread)
+        sink.play(source)
+        self.assertIn(source, sink._sources)
+        del sink
+
+    def test_SoundSource_changes(self):
+        source = SoundSource()
+        changes = _pop_changes(source)
+        first = next(changes)
+        # Changes made meanwhile, e.g. by other threads, are not lost.
+        source.gain = 0.5
+        rest = set(changes)
+        self.assertEqual(rest | set([first]),
+                         set([al.AL_GAIN, al.AL_PITCH, al.AL_POSITION,
+                              al.AL_VELOCITY]))
+        self.assertEqual(len(source.changedproperties), 0)
+
+        # Assigning changes lets the SoundSink apply them on the next update.
+        sink = SoundSink()
+        sink.activate()
+        sink.play(source)
+        sink.update()
+        sid = sink._sources[source]
+        source.dataproperties[al.AL_GAIN] = 0.25
+        source.changedproperties = [al.AL_GAIN]
+        self.assertIn(source, sink._dirty)
+        sink.update()
+        self.assertEqual(_get_source_value(sid, al.AL_GAIN)[0], 0.25)
+        source.changedproperties = []
+        self.assertNotIn(source, sink._dirty)
+        del sink
+
+    @unittest.skipIf(asyncio is None, "asyncio is not available")
+    def test_SoundSink_asyncio(self):
+        sink = SoundSink()
+        sink.activate()
+        loop = asyncio.new_event_loop()
+        source = SoundSource()
+        data = SoundData(b"\0\0" * 100, 1, 16, 200, 44100)
+        source.queue(data)
+        processed = sink.wait_processed(source, data, loop)
+        stopped = sink.wait_stopped(source, loop)
+        sink.play(source)
+        driver = sink.update_async(0.001, loop)
+        loop.run_until_complete(asyncio.wait_for(processed, 5))
+        loop.run_until_complete(asyncio.wait_for(stopped, 5))
+        self.assertFalse(driver.done())
+        driver.cancel()
+
+        # Without a loop, the running event loop is used.
+        if hasattr(asyncio, "get_running_loop"):
+            self.assertRaises(RuntimeError, sink.wait_stopped, source)
+        futures = []
+        loop.call_soon(lambda: futures.append(sink.wait_stopped(source)))
+        loop.run_until_complete(asyncio.sleep(0.01))
+        self.assertEqual(len(futures), 1)
+        sink.detach(source)
+        loop.run_until_complete(asyncio.wait_for(futures[0], 5))
+        loop.close()
+        del sink
+
+    def test_NamePool(self):
+        counter = [0]
+        def generate(count):
+            names = list(range(counter[0], counter[0] + count))
+            counter[0] += count
+            return names
+
+        pool = _NamePool(generate, 4)
+        self.assertEqual(pool.size, 0)
+        self.assertEqual(len(pool), 0)
+        pool.reserve(2)
+        self.assertEqual(pool.size, 2)
+        names = [pool.acquire(), pool.acquire()]
+        self.assertEqual(sorted(names), [0, 1])
+        self.assertEqual(len(pool), 0)
+        # exhausted, allocates a new block
+        self.assertIn(pool.acquire(), (2, 3, 4, 5))
+        self.assertEqual(pool.size, 6)
+        self.assertEqual(len(pool), 3)
+        pool.release(names[0])
+        self.assertEqual(len(pool), 4)
+        self.assertEqual(pool.acquire(), names[0])
+
+        deleted = []
+        pool = _NamePool(generate, 4, deleted.extend, 2)
+        names = [pool.acquire() for x in range(4)]
+        self.assertEqual(pool.size, 4)
+        for name in names:
+            pool.release(name)
+        pool.trim()
+        # The least recently released names are deleted first.
+        self.assertEqual(deleted, names[:2])
+        self.assertEqual(pool.size, 2)
+        self.assertEqual(len(pool), 2)
+
+    def test_BufferCache(self):
+        cache = _BufferCache(2)
+        data1, data2, data3 = SoundData(), SoundData(), SoundData()
+        self.assertIsNone(cache.get(data1))
+        cache.add(data1, 1)
+        cache.add(data2, 2)
+        cache.add(data3, 3)
+        self.assertEqual(cache.get(data1), 1)
+        self.assertTrue(1 in cache)
+        self.assertEqual(len(cache), 3)
+
+        # data2 is the least recently used one, data1 is in use
+        cache.acquire(1)
+        self.assertEqual(cache.purge(), [2])
+        self.assertIsNone(cache.get(data2))
+        self.assertEqual(len(cache), 2)
+
+        # Collected SoundData buffers are freed, once they are unqueued.
+        del data1
+        gc.collect()
+        self.assertEqual(cache.purge(), [])
+        self.assertTrue(cache.release(1))
+        self.assertFalse(1 in cache)
+
 
 if __name__ == "__main__":
     sys.exit(unittest.main())
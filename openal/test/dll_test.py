@@ -0,0 +1,130 @@
+import os
+import ctypes
+import shutil
+import sys
+import tempfile
+import unittest
+from .. import dll, al, efx, UnavailableFunctionError, CallStats, \
+    set_call_stats_enabled, get_call_stats, reset_call_stats, _DLL, \
+    _get_dll_cachefile, _read_dll_cache
+
+
+class OpenALDLLTest(unittest.TestCase):
+
+    def test_bind_function(self):
+        func = dll.bind_function("alGetError", None, al.ALenum)
+        self.assertEqual(func(), al.AL_NO_ERROR)
+        self.assertRaises(UnavailableFunctionError, dll.bind_function,
+                          "alNoSuchFunction")
+        self.assertRaises(AttributeError, dll.bind_function,
+                          "alNoSuchFunction")
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     "module __getattr__() requires Python 3.7 or newer")
+    def test_bind_functions(self):
+        self.assertIn("alDopplerVelocity", dir(al))
+        self.assertIn("alGenEffects", dir(efx))
+        func = al.alDopplerVelocity
+        self.assertIs(vars(al)["alDopplerVelocity"], func)
+        self.assertIs(al.alDopplerVelocity, func)
+        self.assertRaises(AttributeError, getattr, al, "alNoSuchFunction")
+
+        namespace = {"__name__": "test"}
+        dll.bind_functions(namespace, {"alNoSuchFunction": (None, None),
+                                       "alGetError": (None, al.ALenum)})
+        self.assertEqual(sorted(namespace["__dir__"]())[-2:],
+                         ["alGetError", "alNoSuchFunction"])
+        getter = namespace["__getattr__"]
+        self.assertEqual(getter("alGetError")(), al.AL_NO_ERROR)
+        self.assertIn("alGetError", namespace)
+        with self.assertRaises(UnavailableFunctionError) as context:
+            getter("alNoSuchFunction")
+        self.assertEqual(context.exception.funcname, "alNoSuchFunction")
+        self.assertNotIn("alNoSuchFunction", namespace)
+        self.assertRaises(AttributeError, getter, "alOther")
+
+    def test_call_stats(self):
+        enabled = dll.instrumented
+        try:
+            set_call_stats_enabled(True)
+            self.assertTrue(dll.instrumented)
+            reset_call_stats()
+            self.assertEqual(get_call_stats(), {})
+            al.alGetError()
+            al.alGetError()
+            values = (al.ALint * 4)()
+            al.alGetIntegerv(al.AL_DISTANCE_MODEL, values)
+            stats = get_call_stats()
+            self.assertEqual(set(stats), set(["alGetError", "alGetIntegerv"]))
+            self.assertIsInstance(stats["alGetError"], CallStats)
+            self.assertEqual(stats["alGetError"].calls, 2)
+            self.assertGreaterEqual(stats["alGetError"].time, 0)
+            self.assertEqual(stats["alGetError"].argbytes, 0)
+            self.assertEqual(stats["alGetIntegerv"].argbytes, 16)
+            self.assertEqual(stats["alGetIntegerv"].maxargbytes, 16)
+
+            set_call_stats_enabled(False)
+            self.assertFalse(hasattr(al.alGetError, "__wrapped__"))
+            al.alGetError()
+            self.assertEqual(get_call_stats()["alGetError"].calls, 2)
+            reset_call_stats()
+            self.assertEqual(get_call_stats(), {})
+        finally:
+            set_call_stats_enabled(enabled)
+
+    def test_DLL_discovery(self):
+        path, libname = os.path.split(dll.libfile)
+        libname = os.path.splitext(libname)[0]
+        tmpdir = tempfile.mkdtemp()
+        try:
+            cachefile = os.path.join(tmpdir, "pyal", "dllcache")
+            lib = _DLL("OpenAL", [libname], path, cachefile=cachefile)
+            self.assertEqual(lib.libfile, dll.libfile)
+            # Libraries in path are not cached.
+            self.assertEqual(_read_dll_cache(cachefile), {})
+
+            # The cached location of a previous find_library() result is
+            # used, if the library can not be found in path.
+            other = os.path.join(tmpdir, os.path.basename(dll.libfile))
+            shutil.copy(dll.libfile, other)
+            key = "%s-%d:%s" % (sys.platform,
+                                ctypes.sizeof(ctypes.c_void_p) * 8, path)
+            os.makedirs(os.path.dirname(cachefile))
+            with open(cachefile, "w") as fp:
+                fp.write("%s\t%s\n" % (key, other))
+            lib = _DLL("OpenAL", ["nonexisting"], path, cachefile=cachefile)
+            self.assertEqual(lib.libfile, other)
+
+            # Libraries in path are preferred over the cached location.
+            lib = _DLL("OpenAL", [libname], path, cachefile=cachefile)
+            self.assertEqual(lib.libfile, dll.libfile)
+            self.assertEqual(_read_dll_cache(cachefile), {key: other})
+        finally:
+            shutil.rmtree(tmpdir)
+
+        lib = _DLL("OpenAL", ["nonexisting"],
+                   sonames={"DEFAULT": ["nonexisting.so", dll.libfile]})
+        self.assertEqual(lib.libfile, dll.libfile)
+        self.assertRaises(RuntimeError, _DLL, "OpenAL", ["nonexisting"],
+                          sonames={"DEFAULT": ["nonexisting.so"]})
+
+    def test_get_dll_cachefile(self):
+        value = os.environ.get("PYAL_DLL_CACHE")
+        try:
+            os.environ["PYAL_DLL_CACHE"] = "cachefile"
+            self.assertEqual(_get_dll_cachefile(), "cachefile")
+            os.environ["PYAL_DLL_CACHE"] = ""
+            self.assertIsNone(_get_dll_cachefile())
+            del os.environ["PYAL_DLL_CACHE"]
+            cachefile = _get_dll_cachefile()
+            if cachefile is not None:
+                self.assertEqual(os.path.basename(cachefile), "dllcache")
+        finally:
+            if value is None:
+                os.environ.pop("PYAL_DLL_CACHE", None)
+            else:
+                os.environ["PYAL_DLL_CACHE"] = value
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -1,7 +1,10 @@
+import io
 import os
 import sys
+import threading
 import unittest
 from .. import al, loaders
+from ..audio import SoundSink, SoundSource, StreamingSoundData
 
 RESPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
 
@@ -16,6 +19,52 @@ class OpenALAudioTest(unittest.TestCase):
         self.assertEqual(snddata.frequency, 44100)
         self.assertEqual(snddata.size, 122880)
 
+    def test_load_file_cache(self):
+        wavfile = os.path.join(RESPATH, "hey.wav")
+        loaders.invalidate_cache()
+        before = loaders.cache_info()
+        self.assertEqual(before.count, 0)
+        self.assertEqual(before.size, 0)
+
+        snddata = loaders.load_file(wavfile)
+        self.assertIs(loaders.load_file(wavfile), snddata)
+        self.assertIsNot(loaders.load_file(wavfile, cache=False), snddata)
+        info = loaders.cache_info()
+        self.assertEqual(info.hits, before.hits + 1)
+        self.assertEqual(info.misses, before.misses + 1)
+        self.assertEqual(info.count, 1)
+        self.assertEqual(info.size, 122880)
+
+        loaders.invalidate_cache(wavfile)
+        self.assertEqual(loaders.cache_info().count, 0)
+        self.assertIsNot(loaders.load_file(wavfile), snddata)
+
+        limit = info.limit
+        loaders.set_cache_limit(1000)
+        self.assertEqual(loaders.cache_info().count, 0)
+        loaders.load_file(wavfile)
+        self.assertEqual(loaders.cache_info().count, 0)
+        loaders.set_cache_limit(limit)
+
+    def test_load_files(self):
+        wavfile = os.path.join(RESPATH, "hey.wav")
+        fnames = [wavfile] * 4
+        snddata = loaders.load_files(fnames, workers=2, cache=False)
+        self.assertEqual(len(snddata), 4)
+        for snd in snddata:
+            self.assertEqual(snd.size, 122880)
+            self.assertEqual(snd.frequency, 44100)
+
+        loaded = list(loaders.load_files(fnames, workers=2, ordered=False,
+                                         cache=False))
+        self.assertEqual(len(loaded), 4)
+        for fname, snd in loaded:
+            self.assertEqual(fname, wavfile)
+            self.assertEqual(snd.size, 122880)
+
+        self.assertRaises(ValueError, loaders.load_files,
+                          [wavfile, "invalid.xyz"])
+
     def test_load_wav_file(self):
         wavfile = os.path.join(RESPATH, "hey.wav")
         snddata = loaders.load_wav_file(wavfile)
@@ -24,10 +73,86 @@ class OpenALAudioTest(unittest.TestCase):
         self.assertEqual(snddata.frequency, 44100)
         self.assertEqual(snddata.size, 122880)
 
-    @unittest.skip("not implemented")
+    def test_load_wav_file_mmap(self):
+        wavfile = os.path.join(RESPATH, "hey.wav")
+        snddata = loaders.load_wav_file(wavfile, use_mmap=True)
+
+        self.assertEqual(snddata.format, al.AL_FORMAT_MONO16)
+        self.assertEqual(snddata.frequency, 44100)
+        self.assertEqual(snddata.size, 122880)
+        self.assertIsInstance(snddata.data, memoryview)
+        self.assertTrue(snddata.data.readonly)
+        self.assertEqual(snddata.data.tobytes(),
+                         loaders.load_wav_file(wavfile).data)
+
+        self.assertRaises(ValueError, loaders.load_wav_file, __file__, True)
+
     def test_load_stream(self):
-        pass
+        wavfile = os.path.join(RESPATH, "hey.wav")
+        with open(wavfile, "rb") as fp:
+            stream = loaders.load_stream(fp)
+            self.assertIsInstance(stream, StreamingSoundData)
+            self.assertEqual(stream.format, al.AL_FORMAT_MONO16)
+            self.assertEqual(stream.frequency, 44100)
+            self.assertEqual(stream.size, 122880)
+
+            chunks = []
+            chunk = stream.read(48000)
+            while chunk:
+                chunks.append(chunk)
+                chunk = stream.read(48000)
+            self.assertEqual([len(c) for c in chunks], [48000, 48000, 26880])
+            self.assertEqual(stream.tell(), 122880)
+            stream.seek(0)
+            self.assertEqual(stream.read(), b"".join(chunks))
+            self.assertEqual(b"".join(chunks),
+                             loaders.load_file(wavfile).data)
+
+        class Pipe(object):
+            def __init__(self, data):
+                self.data = io.BytesIO(data)
+
+            def read(self, size=-1):
+                return self.data.read(min(size, 1000))
+
+        with open(wavfile, "rb") as fp:
+            data = fp.read()
+        stream = loaders.load_stream(Pipe(data))
+        self.assertEqual(stream.size, 122880)
+        self.assertEqual(len(stream.read(4000)), 1000)
+        self.assertRaises(IOError, stream.seek, 0)
+
+        self.assertRaises(ValueError, loaders.load_stream,
+                          io.BytesIO(b"RIFF\0\0\0\0AVI "))
+
+    def test_load_stream_looping_pipe(self):
+        wavfile = os.path.join(RESPATH, "hey.wav")
+        with open(wavfile, "rb") as fp:
+            data = fp.read()
+        rfd, wfd = os.pipe()
+        writer = threading.Thread(target=self._write_pipe, args=(wfd, data))
+        writer.start()
+        sink = SoundSink()
+        sink.activate()
+        try:
+            with os.fdopen(rfd, "rb") as fp:
+                stream = loaders.load_stream(fp)
+                source = SoundSource()
+                source.looping = True
+                source.queue(stream)
+                sink.play(source)
+                # A looping stream, which can not be rewound, ends instead
+                # of failing the updates.
+                for index in range(10):
+                    sink.update()
+                self.assertNotIn(source, sink._streams)
+        finally:
+            writer.join()
+            del sink
 
+    def _write_pipe(self, fd, data):
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
 
 if __name__ == "__main__":
     sys.exit(unittest.main())
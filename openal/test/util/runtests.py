@@ -15,10 +15,7 @@ import inspect
 
 from . import support, testrunner
 
-if sys.version_info[0] >= 3:
-    MAXINT = sys.maxsize
-else:
-    MAXINT = sys.maxint
+MAXINT = sys.maxsize
 
 LINEDELIM = "-" * 70
 HEAVYDELIM = "=" * 70
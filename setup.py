@@ -7,6 +7,9 @@ VERSION = "0.2.0"
 
 if __name__ == "__main__":
 
+    if sys.version_info < (3, 3):
+        raise SystemExit("PyAL requires Python 3.3 or newer")
+
     if "--format=msi" in sys.argv or "bdist_msi" in sys.argv:
         # hack the version name to a format msi doesn't have trouble with
         VERSION = VERSION.replace("-alpha", "a")
@@ -39,12 +42,10 @@ if __name__ == "__main__":
             "License :: OSI Approved :: zlib/libpng License",
             "Operating System :: OS Independent",
             "Programming Language :: Python",
-            "Programming Language :: Python :: 2.7",
             "Programming Language :: Python :: 3",
-            "Programming Language :: Python :: 3.2",
+            "Programming Language :: Python :: 3 :: Only",
             "Programming Language :: Python :: 3.3",
             "Programming Language :: Python :: Implementation :: CPython",
-            "Programming Language :: Python :: Implementation :: IronPython",
             "Programming Language :: Python :: Implementation :: PyPy",
             "Topic :: Multimedia :: Sound/Audio",
             "Topic :: Software Development :: Libraries :: Python Modules",